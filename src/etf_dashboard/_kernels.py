@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# The per-bar Python loops below beat pandas' ewm chain only on short inputs and
+# scale linearly, so each tail helper switches to the pandas implementation past
+# its own crossover (latest value, best of 7x200 runs):
+#   bars   macd loop / pandas   rsi loop / pandas
+#    250      170 /  500 us       155 /  820 us
+#    700      470 /  500 us       410 /  830 us
+#   1000      670 /  515 us       595 /  850 us
+#   1400      945 /  525 us       820 /  875 us
+# MACD advances three EMAs per bar and crosses over near 750 bars; RSI near 1400.
+_MACD_TAIL_LOOP_MAX_BARS = 700
+_RSI_TAIL_LOOP_MAX_BARS = 1200
+
+
+def sma_multi(close: np.ndarray, windows: Sequence[int] | np.ndarray) -> np.ndarray:
+    """Simple moving averages for several windows, matching `rolling(window=w, min_periods=w).mean()`.
+
+    Returns an (n, len(windows)) float64 buffer where column k holds the SMA of
+    windows[k]; a value is NaN until w non-NaN observations fill the window.
+
+    Each window is summed on its own (a strided view, no running prefix sum), so
+    results do not drift with the length of the history. A constant window
+    yields the repeated value itself, as pandas does: sum / w could round away
+    from it and flip `close < ma` or a zero slope on a flat tail.
+    """
+    a = np.asarray(close, dtype=np.float64)
+    wins = np.asarray(windows, dtype=np.int64)
+    n = a.shape[0]
+    out = np.full((n, wins.shape[0]), np.nan, dtype=np.float64)
+    if n == 0:
+        return out
+
+    # run[i]: length of the run of equal values ending at i (NaN never equals itself, so it breaks runs).
+    idx = np.arange(n)
+    starts = np.zeros(n, dtype=np.int64)
+    starts[1:] = np.where(a[1:] == a[:-1], 0, idx[1:])
+    run = idx - np.maximum.accumulate(starts) + 1
+
+    for k in range(wins.shape[0]):
+        w = int(wins[k])
+        if w <= 0 or w > n:
+            continue
+        col = out[w - 1 :, k]
+        # A NaN anywhere in the window propagates through the sum, as min_periods=w requires.
+        # A single full-length window (window_mean's tail) skips the strided view; same sum either way.
+        if w == n:
+            col[0] = a.sum()
+        else:
+            np.sum(sliding_window_view(a, w), axis=1, out=col)
+        col /= w
+        flat = run[w - 1 :] >= w
+        col[flat] = a[w - 1 :][flat]
+
+    return out
+
+
+def last_valid(a: np.ndarray) -> float | None:
+    """Last non-NaN value of a 1-D array (None if there is none)."""
+    for i in range(a.shape[0] - 1, -1, -1):
+        v = a[i]
+        if v == v:
+            return float(v)
+    return None
+
+
+def window_mean(a: np.ndarray, window: int) -> float | None:
+    """`rolling(window, min_periods=window).mean()` at the last element of `a`.
+
+    None when `a` is shorter than the window, NaN when the window holds a NaN.
+    Only the last `window` values are read; they go through `sma_multi` so the
+    constant-window rule is the same everywhere.
+    """
+    w = int(window)
+    n = a.shape[0]
+    if w <= 0 or n < w:
+        return None
+    return float(sma_multi(a[n - w :], (w,))[-1, 0])
+
+
+def tail_mean(a: np.ndarray, window: int) -> float | None:
+    """Latest defined value of `rolling(window, min_periods=window).mean()`.
+
+    Reads the last `window` values in the common NaN-free case; a NaN inside
+    that tail falls back to the full rolling series.
+    """
+    m = window_mean(a, window)
+    if m is None or m == m:
+        return m
+    return last_valid(sma_multi(a, (int(window),))[:, 0])
+
+
+def _ewm_alpha(com: float) -> float:
+    # pandas derives alpha from the centre of mass: alpha = 1 / (1 + com).
+    return 1.0 / (1.0 + com)
+
+
+def _ewm_step(weighted: float, old_wt: float, cur: float, alpha: float) -> tuple[float, float]:
+    """One step of pandas' `ewm(adjust=False, ignore_na=False).mean()` recurrence.
+
+    Mirrors pandas' Cython loop operation for operation so results are
+    bit-identical: NaN inputs decay the old weight, a NaN state is seeded by
+    the first observation, and equal values short-circuit.
+    """
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if cur == cur:
+            if weighted != cur:
+                weighted = old_wt * weighted + alpha * cur
+                weighted /= old_wt + alpha
+            old_wt = 1.0
+    elif cur == cur:
+        weighted = cur
+    return weighted, old_wt
+
+
+def rsi_array(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder RSI in one pass over `close`; bit-identical to `indicators.rsi`.
+
+    avg_gain/avg_loss follow `ewm(alpha=1/period, adjust=False, min_periods=period)`
+    and bars where avg_loss == 0 are NaN, as `avg_loss.replace(0, np.nan)` made them.
+    """
+    a = np.asarray(close, dtype=np.float64)
+    n = a.shape[0]
+    out = [math.nan] * n
+    # diff + clip(lower=0) in two vectorised passes (NaN propagates through np.maximum).
+    d = np.diff(a)
+    gains = np.maximum(d, 0.0).tolist()
+    losses = np.maximum(-d, 0.0).tolist()
+    alpha = _ewm_alpha((1 - 1 / period) / (1 / period))
+    g = l = math.nan
+    g_wt = l_wt = 1.0
+    nobs = 0
+    for i in range(n - 1):
+        gain = gains[i]
+        if gain == gain:
+            nobs += 1
+        g, g_wt = _ewm_step(g, g_wt, gain, alpha)
+        l, l_wt = _ewm_step(l, l_wt, losses[i], alpha)
+        if nobs >= period and l != 0 and g == g and l == l:
+            out[i + 1] = 100 - (100 / (1 + g / l))
+    return np.array(out, dtype=np.float64)
+
+
+def rsi_tail(close: np.ndarray, period: int = 14) -> float | None:
+    """Latest defined value of `indicators.rsi(close, period)` without building a Series."""
+    a = np.asarray(close, dtype=np.float64)
+    if a.shape[0] > _RSI_TAIL_LOOP_MAX_BARS:
+        from .indicators import rsi
+
+        return last_valid(rsi(pd.Series(a), period).to_numpy())
+    return last_valid(rsi_array(a, period))
+
+
+def macd_arrays(
+    close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram from one pass that advances all three EMAs per bar.
+
+    Each EMA follows `ewm(span=..., adjust=False, min_periods=span)` exactly, so
+    the arrays match `indicators.macd` bit for bit.
+    """
+    x = np.asarray(close, dtype=np.float64).tolist()
+    n = len(x)
+    m_out = [math.nan] * n
+    sg_out = [math.nan] * n
+    h_out = [math.nan] * n
+    a_fast = _ewm_alpha((fast - 1) / 2)
+    a_slow = _ewm_alpha((slow - 1) / 2)
+    a_sig = _ewm_alpha((signal - 1) / 2)
+    f = s = sg = math.nan
+    f_wt = s_wt = sg_wt = 1.0
+    nobs = nobs_line = 0
+    for i in range(n):
+        cur = x[i]
+        if cur == cur:
+            nobs += 1
+        f, f_wt = _ewm_step(f, f_wt, cur, a_fast)
+        s, s_wt = _ewm_step(s, s_wt, cur, a_slow)
+        line = f - s if nobs >= fast and nobs >= slow else math.nan
+        if line == line:
+            nobs_line += 1
+        m_out[i] = line
+        sg, sg_wt = _ewm_step(sg, sg_wt, line, a_sig)
+        if nobs_line >= signal:
+            sg_out[i] = sg
+            h_out[i] = line - sg
+    return (
+        np.array(m_out, dtype=np.float64),
+        np.array(sg_out, dtype=np.float64),
+        np.array(h_out, dtype=np.float64),
+    )
+
+
+def macd_tail(
+    close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[float | None, float | None, float | None]:
+    """Latest defined (macd, signal, hist) of `indicators.macd` without building a DataFrame."""
+    a = np.asarray(close, dtype=np.float64)
+    if a.shape[0] > _MACD_TAIL_LOOP_MAX_BARS:
+        from .indicators import macd
+
+        df = macd(pd.Series(a), fast, slow, signal)
+        return last_valid(df["macd"].to_numpy()), last_valid(df["signal"].to_numpy()), last_valid(df["hist"].to_numpy())
+    m, sg, h = macd_arrays(a, fast, slow, signal)
+    return last_valid(m), last_valid(sg), last_valid(h)
@@ -2,19 +2,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
-from .indicators import sma
+from ._kernels import sma_multi
+from .indicators import MA_WINDOWS
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChartData:
     df: pd.DataFrame
 
 
 def prepare_chart_data(
     hist: pd.DataFrame,
-    ma_windows: list[int] | None = None,
+    ma_windows: list[int] | tuple[int, ...] | None = None,
     volume_avg_window: int = 20,
 ) -> ChartData:
     """Prepare a chart-ready dataframe.
@@ -27,16 +29,18 @@ def prepare_chart_data(
     Assumes hist index is datetime-like.
     """
     if ma_windows is None:
-        ma_windows = [5, 10, 20, 50, 60, 150, 200]
+        ma_windows = MA_WINDOWS
 
-    df = hist[["Open", "High", "Low", "Close", "Volume"]].copy()
-    df.index = pd.to_datetime(df.index)
+    # Column selection yields a new frame and MA/VAVG columns are appended, never written in place.
+    df = hist[["Open", "High", "Low", "Close", "Volume"]]
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
 
-    close = df["Close"].astype(float)
-    for w in ma_windows:
-        df[f"MA{w}"] = sma(close, int(w))
+    windows = np.asarray(ma_windows, dtype=np.int64)
+    ma = sma_multi(df["Close"].to_numpy(dtype=np.float64), windows)
+    df = pd.concat([df, pd.DataFrame(ma, index=df.index, columns=[f"MA{w}" for w in windows])], axis=1)
 
-    v = df["Volume"].astype(float)
-    df[f"VAVG{int(volume_avg_window)}"] = v.rolling(window=int(volume_avg_window), min_periods=int(volume_avg_window)).mean()
+    v = df["Volume"].to_numpy(dtype=np.float64)
+    df[f"VAVG{int(volume_avg_window)}"] = sma_multi(v, (int(volume_avg_window),))[:, 0]
 
     return ChartData(df=df)
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from ._kernels import last_valid, macd_tail, rsi_tail, sma_multi, tail_mean
 from .data_yahoo import (
     fetch_snapshot,
     yahoo_history_url,
     yahoo_quote_url,
 )
-from .indicators import latest_value, macd, pct, rsi, sma
+from .history import HistoryArrays
+from .indicators import MA_WINDOWS, pct
 from .laowang import (
+    GapStatus,
+    IslandReversal,
+    MassiveVolumeLevel,
+    ReclaimSignal,
     bearish_omens,
     detect_island_reversal,
     detect_island_reversal_bullish,
@@ -25,7 +34,7 @@ from .report_md import ReportInputs, render_report_md
 from .rules import choose_win_rate_breakdown, san_sheng_wu_nai, san_yang_kai_tai, trend_regime, volume_signal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Derived:
     p_now: float | None
     open_: float | None
@@ -49,6 +58,7 @@ class Derived:
     macd_hist: float | None
 
     # Risk controls / patterns
+    p_high_hist: float | None  # 252-day High from history (P_high fallback)
     trailing_stop: float | None
     trailing_stop_hit: bool | None
 
@@ -82,6 +92,17 @@ class Derived:
     bearish_distribution_day: bool | None
 
 
+@dataclass(frozen=True, slots=True)
+class LaowangBundle:
+    """Detailed 老王 detector results (dates/levels) behind the Derived booleans."""
+
+    gap: GapStatus
+    reclaim: ReclaimSignal
+    island_bear: IslandReversal | None
+    island_bull: IslandReversal | None
+    mv: MassiveVolumeLevel
+
+
 def _compute_from_history(
     hist: pd.DataFrame,
     volume_avg_window: int = 20,
@@ -93,45 +114,51 @@ def _compute_from_history(
     laowang_lookback_days: int = 120,
     vol_spike_mult: float = 2.0,
     vol_spike_window: int = 20,
-) -> Derived:
-    close = hist["Close"].astype(float)
-    open_ = hist["Open"].astype(float)
-
-    ma5_s = sma(close, 5)
-    ma10_s = sma(close, 10)
-    ma20_s = sma(close, 20)
-    ma50_s = sma(close, 50)
-    ma60_s = sma(close, 60)
-    ma150_s = sma(close, 150)
-    ma200_s = sma(close, 200)
-
-    bias60_s = (close - ma60_s) / ma60_s * 100.0
-
-    def _slope_5d(s: pd.Series) -> float | None:
-        clean = s.dropna()
+    arrays: HistoryArrays | None = None,
+) -> tuple[Derived, LaowangBundle]:
+    # Numeric work runs on the columnar float64 arrays; everything below works on scalars.
+    if arrays is None:
+        arrays = HistoryArrays.from_frame(hist)
+    close = arrays.close
+    open_ = arrays.open_
+    v = arrays.volume
+
+    # One prefix-sum pass for every MA; columns follow MA_WINDOWS (MA5, MA10, MA20, MA50, MA60, MA150, MA200).
+    ma = sma_multi(close, MA_WINDOWS)
+    ma5, ma10, ma20, ma50, ma60, ma150, ma200 = (last_valid(ma[:, k]) for k in range(len(MA_WINDOWS)))
+
+    p_now = last_valid(close)
+
+    # Bias is read from one bar where both Close and MA60 are defined (latest such bar).
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bias60 = last_valid((close - ma[:, 4]) / ma[:, 4] * 100.0)
+
+    def _slope_5d(s: np.ndarray) -> float | None:
+        # Common case: the last 6 values are defined, so the slope is two direct reads.
+        if s.shape[0] >= 6 and not np.isnan(s[-6:]).any():
+            return float(s[-1] - s[-6])
+        clean = s[~np.isnan(s)]
         if len(clean) < 6:
             return None
-        return float(clean.iloc[-1] - clean.iloc[-6])
+        return float(clean[-1] - clean[-6])
 
     # MA slopes: today - 5 trading days ago
-    ma5_slope = _slope_5d(ma5_s)
-    ma10_slope = _slope_5d(ma10_s)
-    ma20_slope = _slope_5d(ma20_s)
+    ma5_slope = _slope_5d(ma[:, 0])
+    ma10_slope = _slope_5d(ma[:, 1])
+    ma20_slope = _slope_5d(ma[:, 2])
 
-    v = hist["Volume"].astype(float)
-    v_avg_s = v.rolling(window=volume_avg_window, min_periods=volume_avg_window).mean()
+    # Only the latest average is consumed: read the tail instead of a full rolling series.
+    v_avg = tail_mean(v, int(volume_avg_window))
 
-    rsi_s = rsi(close, 14)
-    macd_df = macd(close, 12, 26, 9)
-
-    p_now = latest_value(close)
+    # RSI/MACD are recursive, but only their latest values are reported: fold them to scalars.
+    rsi14 = rsi_tail(close, 14)
+    macd_line, macd_signal, macd_hist = macd_tail(close, 12, 26, 9)
 
     # Trailing stop based on P_high (proxy: 252d High in history "High")
     p_high_hist = None
-    if "High" in hist.columns and not hist["High"].dropna().empty:
-        last = hist["High"].astype(float).tail(252)
-        if not last.dropna().empty:
-            p_high_hist = float(last.max())
+    last = arrays.high[-252:]
+    if last.size and not np.isnan(last).all():
+        p_high_hist = float(np.nanmax(last))
 
     trailing_stop = None
     trailing_stop_hit = None
@@ -141,7 +168,13 @@ def _compute_from_history(
             trailing_stop_hit = float(p_now) < trailing_stop
 
     # 老王 signals (統一版：嚴格缺口 + 效期 + 收盤封閉)
-    gap = detect_last_gap(hist, gap_threshold=float(gap_threshold), lookback_days=int(laowang_lookback_days))
+    # Detectors share the snapshot's arrays and take their own zero-copy tail views.
+    gap = detect_last_gap(
+        hist,
+        gap_threshold=float(gap_threshold),
+        lookback_days=int(laowang_lookback_days),
+        arrays=arrays,
+    )
     gap_kind = gap.last_gap.kind if gap.last_gap is not None else None
 
     gap_open = None
@@ -159,7 +192,7 @@ def _compute_from_history(
     gap_filled_by_close = gap.is_filled_by_close
     gap_fill_date_by_close = gap.fill_date_by_close
 
-    reclaim = gap_reclaim_within_3_days(gap, hist)
+    reclaim = gap_reclaim_within_3_days(gap, hist, arrays=arrays)
     gap_reclaim_3d = reclaim.is_reclaim
     gap_reclaim_date = reclaim.reclaim_date
 
@@ -169,6 +202,7 @@ def _compute_from_history(
         min_separation_days=int(island_min_days),
         max_separation_days=int(island_max_days),
         lookback_days=int(laowang_lookback_days),
+        arrays=arrays,
     )
     island_reversal_bearish = island_bear is not None
 
@@ -178,43 +212,45 @@ def _compute_from_history(
         min_separation_days=int(island_min_days),
         max_separation_days=int(island_max_days),
         lookback_days=int(laowang_lookback_days),
+        arrays=arrays,
     )
     island_reversal_bullish = island_bull is not None
 
     # 爆量防守/壓力 (spec): massive_vol = lookback_days 內最高量
-    mv = massive_volume_levels(hist, lookback_days=int(vol_spike_window))
+    mv = massive_volume_levels(hist, lookback_days=int(vol_spike_window), arrays=arrays)
     vol_spike = mv.is_massive
     vol_spike_defense = mv.low
     vol_spike_resistance = mv.high
     vol_spike_defense_broken = mv.low_broken
     vol_spike_resistance_broken = mv.high_broken
 
-    omen = bearish_omens(hist, vol_avg_window=int(vol_spike_window))
+    omen = bearish_omens(hist, vol_avg_window=int(vol_spike_window), arrays=arrays)
     bearish_long_black_engulf = omen.long_black_engulf
     bearish_price_up_vol_down = omen.price_up_vol_down
     bearish_distribution_day = omen.distribution_day
 
-    return Derived(
+    derived = Derived(
         p_now=p_now,
-        open_=latest_value(open_),
-        close=latest_value(close),
-        ma5=latest_value(ma5_s),
-        ma10=latest_value(ma10_s),
-        ma20=latest_value(ma20_s),
-        ma50=latest_value(ma50_s),
-        ma60=latest_value(ma60_s),
-        ma150=latest_value(ma150_s),
-        ma200=latest_value(ma200_s),
-        bias60=latest_value(bias60_s),
+        open_=last_valid(open_),
+        close=p_now,
+        ma5=ma5,
+        ma10=ma10,
+        ma20=ma20,
+        ma50=ma50,
+        ma60=ma60,
+        ma150=ma150,
+        ma200=ma200,
+        bias60=bias60,
         ma5_slope=ma5_slope,
         ma10_slope=ma10_slope,
         ma20_slope=ma20_slope,
-        v_today=latest_value(v),
-        v_avg=latest_value(v_avg_s),
-        rsi14=latest_value(rsi_s),
-        macd=latest_value(macd_df["macd"]),
-        macd_signal=latest_value(macd_df["signal"]),
-        macd_hist=latest_value(macd_df["hist"]),
+        v_today=last_valid(v),
+        v_avg=v_avg,
+        rsi14=rsi14,
+        macd=macd_line,
+        macd_signal=macd_signal,
+        macd_hist=macd_hist,
+        p_high_hist=p_high_hist,
         trailing_stop=trailing_stop,
         trailing_stop_hit=trailing_stop_hit,
         gap_kind=gap_kind,
@@ -237,9 +273,11 @@ def _compute_from_history(
         bearish_price_up_vol_down=bearish_price_up_vol_down,
         bearish_distribution_day=bearish_distribution_day,
     )
+    bundle = LaowangBundle(gap=gap, reclaim=reclaim, island_bear=island_bear, island_bull=island_bull, mv=mv)
+    return derived, bundle
 
 
-def _p_high_from_info_or_history(info: dict, hist: pd.DataFrame) -> tuple[float | None, str]:
+def _p_high_from_info_or_history(info: dict, p_high_hist: float | None) -> tuple[float | None, str]:
     # Preferred: Yahoo's 52-week high.
     p_high = info.get("fiftyTwoWeekHigh") if isinstance(info, dict) else None
     if p_high is not None:
@@ -248,11 +286,9 @@ def _p_high_from_info_or_history(info: dict, hist: pd.DataFrame) -> tuple[float
         except Exception:
             pass
 
-    # Fallback: last 252 trading days high of 'High' column.
-    if "High" in hist.columns and not hist["High"].dropna().empty:
-        last = hist["High"].astype(float).tail(252)
-        if not last.dropna().empty:
-            return float(last.max()), "HISTORY_252D_HIGH"
+    # Fallback: last 252 trading days high of 'High' column (precomputed in _compute_from_history).
+    if p_high_hist is not None:
+        return float(p_high_hist), "HISTORY_252D_HIGH"
 
     return None, "MISSING"
 
@@ -391,10 +427,15 @@ def build_report(
     if not (0.0 < max_position_pct <= 1.0):
         raise ValueError("max_position_pct must be in (0, 1]")
 
-    snap = fetch_snapshot(ticker, lookback_days=lookback_days)
-    bench = fetch_snapshot(benchmark, lookback_days=lookback_days)
+    # Both fetches are network-bound and independent; overlap them.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        snap_f = ex.submit(fetch_snapshot, ticker, lookback_days=lookback_days)
+        # The benchmark only feeds the regime filter; its info dict is never read.
+        bench_f = ex.submit(fetch_snapshot, benchmark, lookback_days=lookback_days, include_info=False)
+        snap = snap_f.result()
+        bench = bench_f.result()
 
-    d = _compute_from_history(
+    d, lw = _compute_from_history(
         snap.history,
         volume_avg_window=volume_avg_window,
         trailing_stop_pct=trailing_stop_pct,
@@ -404,10 +445,16 @@ def build_report(
         laowang_lookback_days=laowang_lookback_days,
         vol_spike_mult=vol_spike_mult,
         vol_spike_window=vol_spike_window,
+        arrays=snap.arrays,
+    )
+    b, _ = _compute_from_history(
+        bench.history,
+        volume_avg_window=volume_avg_window,
+        trailing_stop_pct=trailing_stop_pct,
+        arrays=bench.arrays,
     )
-    b = _compute_from_history(bench.history, volume_avg_window=volume_avg_window, trailing_stop_pct=trailing_stop_pct)
 
-    p_high, p_high_src = _p_high_from_info_or_history(snap.info, snap.history)
+    p_high, p_high_src = _p_high_from_info_or_history(snap.info, d.p_high_hist)
 
     notes: list[str] = [
         f"P_now/MA/RSI/MACD/均量皆以 Yahoo 日線 history 計算（Close/Volume）。",
@@ -476,21 +523,12 @@ def build_report(
 
     # Island reversal for W: only the most recent type should count.
     # Spec: compare bearish gap-down date vs bullish gap-up date; apply only the later one.
-    # We reuse the already-computed detailed objects (below) to derive recency.
-    island_bear = detect_island_reversal(
-        snap.history,
-        gap_threshold=float(gap_threshold),
-        min_separation_days=int(island_min_days),
-        max_separation_days=int(island_max_days),
-        lookback_days=int(laowang_lookback_days),
-    )
-    island_bull = detect_island_reversal_bullish(
-        snap.history,
-        gap_threshold=float(gap_threshold),
-        min_separation_days=int(island_min_days),
-        max_separation_days=int(island_max_days),
-        lookback_days=int(laowang_lookback_days),
-    )
+    # We reuse the detailed objects already computed by _compute_from_history to derive recency.
+    gap = lw.gap
+    reclaim = lw.reclaim
+    island_bear = lw.island_bear
+    island_bull = lw.island_bull
+    mv = lw.mv
 
     bear_key = (island_bear.end_gap_down.date if island_bear is not None else None)
     bull_key = (island_bull.start_gap_up.date if island_bull is not None else None)
@@ -597,25 +635,6 @@ def build_report(
 
     local_now = datetime.now().astimezone()
 
-    # Re-compute detailed 老王 objects here (report needs dates/levels; Derived keeps booleans/levels only)
-    gap = detect_last_gap(snap.history, gap_threshold=float(gap_threshold), lookback_days=int(laowang_lookback_days))
-    reclaim = gap_reclaim_within_3_days(gap, snap.history)
-    island_bear = detect_island_reversal(
-        snap.history,
-        gap_threshold=float(gap_threshold),
-        min_separation_days=int(island_min_days),
-        max_separation_days=int(island_max_days),
-        lookback_days=int(laowang_lookback_days),
-    )
-    island_bull = detect_island_reversal_bullish(
-        snap.history,
-        gap_threshold=float(gap_threshold),
-        min_separation_days=int(island_min_days),
-        max_separation_days=int(island_max_days),
-        lookback_days=int(laowang_lookback_days),
-    )
-    mv = massive_volume_levels(snap.history, lookback_days=int(vol_spike_window))
-
     inp = ReportInputs(
         ticker=ticker,
         name=(snap.info.get("shortName") if isinstance(snap.info, dict) else None),
@@ -730,10 +749,10 @@ def build_report(
 
 def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(prog="etf-dashboard", description="Evidence-first ETF/Stock dashboard report (Yahoo Finance)")
-    p.add_argument("ticker", help="Yahoo ticker, e.g. VOO or 2330.TW")
+    p.add_argument("tickers", nargs="+", metavar="ticker", help="Yahoo ticker(s), e.g. VOO or 2330.TW")
     p.add_argument("--benchmark", default="^GSPC", help="Benchmark Yahoo ticker (default: ^GSPC)")
     p.add_argument("--out", default="reports", help="Output directory for Markdown reports")
-    p.add_argument("--lookback", type=int, default=400, help="Lookback days (calendar) for history fetch")
+    p.add_argument("--lookback", type=int, default=365, help="Lookback days (calendar) for history fetch")
     p.add_argument("--volume-avg-window", type=int, default=20, help="Rolling window for average volume (default: 20)")
     p.add_argument(
         "--stop-loss-pct",
@@ -798,8 +817,7 @@ def main(argv: list[str] | None = None) -> int:
 
     args = p.parse_args(argv)
 
-    out = build_report(
-        ticker=args.ticker,
+    opts = dict(
         benchmark=args.benchmark,
         out_dir=Path(args.out),
         lookback_days=args.lookback,
@@ -816,8 +834,26 @@ def main(argv: list[str] | None = None) -> int:
         vol_spike_window=int(args.vol_spike_window),
     )
 
-    print(str(out))
-    return 0
+    tickers = list(dict.fromkeys(args.tickers))
+    if len(tickers) == 1:
+        print(str(build_report(ticker=tickers[0], **opts)))
+        return 0
+
+    # Each report is dominated by Yahoo round-trips, so tickers overlap well on threads.
+    with ThreadPoolExecutor(max_workers=min(len(tickers), 8)) as ex:
+        futures = [(t, ex.submit(build_report, ticker=t, **opts)) for t in tickers]
+
+    # One bad ticker must not hide the others: print every written path, report failures per ticker.
+    failed = 0
+    for t, fut in futures:
+        try:
+            out = fut.result()
+        except Exception as e:
+            failed += 1
+            print(f"{t}: {e}", file=sys.stderr)
+        else:
+            print(str(out))
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -1,51 +1,71 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pandas as pd
 import yfinance as yf
 
+from .history import HistoryArrays
 
-@dataclass(frozen=True)
+# The only `Ticker.info` fields the report reads; everything else is dropped right after the fetch.
+_INFO_KEYS = ("fiftyTwoWeekHigh", "shortName")
+
+# Longest warm-up the report needs: the 252-bar P_high window behind the trailing stop, i.e. one
+# calendar year (MA200 + its 5-day slope and the MACD/RSI seeds fit well inside it).
+_MIN_HISTORY_DAYS = 365
+
+
+@dataclass(frozen=True, slots=True)
 class YahooSnapshot:
     ticker: str
     asof_utc: datetime
     history: pd.DataFrame  # columns: Open High Low Close Volume
-    info: dict
+    info: dict  # subset of yfinance `info` restricted to _INFO_KEYS
+    arrays: HistoryArrays  # float64 columns of `history` for the numeric paths
 
 
-def fetch_snapshot(ticker: str, lookback_days: int = 400) -> YahooSnapshot:
+def fetch_snapshot(ticker: str, lookback_days: int = _MIN_HISTORY_DAYS, *, include_info: bool = True) -> YahooSnapshot:
     """Fetch daily history + info from Yahoo Finance via yfinance.
 
     Notes:
     - Uses daily bars. For transparency, we compute indicators from daily *Close*.
-    - `lookback_days` is calendar days; we request more than needed to ensure MA150.
+    - `lookback_days` is calendar days; never less than one year is requested (see _MIN_HISTORY_DAYS).
+    - `include_info=False` skips the extra quoteSummary request; `info` is then `{}`.
     """
     asof_utc = datetime.now(timezone.utc)
 
     t = yf.Ticker(ticker)
 
-    # 2y is safe for MA150 even with holidays; keep it simple.
-    # We still allow lookback_days, but yfinance period is coarse; use max(lookback_days, 400).
-    period_days = max(int(lookback_days), 400)
-    period = "2y" if period_days >= 500 else "1y"
+    # Request the calendar window the caller asked for, floored at the longest indicator warm-up.
+    period_days = max(int(lookback_days), _MIN_HISTORY_DAYS)
+    start = (asof_utc - timedelta(days=period_days)).date()
 
-    hist = t.history(period=period, interval="1d", auto_adjust=False)
+    hist = t.history(start=start, interval="1d", auto_adjust=False)
     if hist is None or hist.empty:
         raise RuntimeError(f"No Yahoo history returned for {ticker}")
 
-    hist = hist[["Open", "High", "Low", "Close", "Volume"]].copy()
-    hist.index = pd.to_datetime(hist.index)
+    # Column selection already returns a new frame; no extra copy needed.
+    hist = hist[["Open", "High", "Low", "Close", "Volume"]]
+    if not isinstance(hist.index, pd.DatetimeIndex):
+        hist.index = pd.to_datetime(hist.index)
 
     info = {}
-    try:
-        info = t.info or {}
-    except Exception:
-        # yfinance may fail on info occasionally; keep running, but the report must mark missing fields.
-        info = {}
-
-    return YahooSnapshot(ticker=ticker, asof_utc=asof_utc, history=hist, info=info)
+    if include_info:
+        try:
+            raw = t.info or {}
+            info = {k: raw[k] for k in _INFO_KEYS if k in raw}
+        except Exception:
+            # yfinance may fail on info occasionally; keep running, but the report must mark missing fields.
+            info = {}
+
+    return YahooSnapshot(
+        ticker=ticker,
+        asof_utc=asof_utc,
+        history=hist,
+        info=info,
+        arrays=HistoryArrays.from_frame(hist),
+    )
 
 
 def yahoo_quote_url(ticker: str) -> str:
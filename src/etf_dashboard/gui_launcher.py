@@ -15,6 +15,17 @@ def _find_free_port() -> int:
         return int(s.getsockname()[1])
 
 
+def _wait_for_port(port: int, attempts: int = 40, interval: float = 0.05) -> bool:
+    """Poll until something listens on 127.0.0.1:port; give up after ~attempts*interval seconds."""
+    for _ in range(attempts):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=interval):
+                return True
+        except OSError:
+            time.sleep(interval)
+    return False
+
+
 def _default_reports_dir() -> Path:
     # User approved: write reports into a user-writable location.
     local_appdata = os.environ.get("LOCALAPPDATA")
@@ -69,8 +80,8 @@ def main() -> None:
         creationflags=creationflags,
     )
 
-    # Best-effort: give the server a moment to bind, then open the browser.
-    time.sleep(1.0)
+    # Best-effort: open the browser as soon as the server accepts connections (bounded wait).
+    _wait_for_port(port)
     webbrowser.open(url)
 
     # Keep the launcher alive while Streamlit is running.
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
@@ -10,35 +10,193 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import streamlit as st
 
-from etf_dashboard.charting import prepare_chart_data
+from etf_dashboard.charting import ChartData, prepare_chart_data
 from etf_dashboard.cli import build_report
-from etf_dashboard.data_yahoo import fetch_snapshot
+from etf_dashboard.data_yahoo import YahooSnapshot, fetch_snapshot
+from etf_dashboard.indicators import MA_WINDOWS
+from etf_dashboard.laowang import (
+    BearishOmens,
+    GapStatus,
+    MassiveVolumeLevel,
+    ReclaimSignal,
+    bearish_omens,
+    detect_last_gap,
+    gap_reclaim_within_3_days,
+    massive_volume_levels,
+)
 
 
 @dataclass(frozen=True)
 class ReportFile:
     path: Path
+    mtime: float  # st_mtime captured once when the directory is listed
 
     @property
     def name(self) -> str:
         return self.path.name
 
-    @property
-    def mtime(self) -> float:
-        return self.path.stat().st_mtime
-
 
 def list_reports(report_dir: Path) -> list[ReportFile]:
     if not report_dir.exists():
         return []
-    files = sorted(report_dir.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
-    return [ReportFile(path=f) for f in files]
+    # DirEntry caches its stat result, so name filtering and the mtime read cost one syscall per file.
+    with os.scandir(report_dir) as it:
+        entries = [(e.name, e.stat().st_mtime) for e in it if e.name.endswith(".md") and e.is_file()]
+    entries.sort(key=lambda t: t[1], reverse=True)
+    return [ReportFile(path=report_dir / name, mtime=m) for name, m in entries]
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+# Every widget change reruns main(); keep Yahoo round-trips off that path for a few minutes.
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_snapshot(ticker: str, lookback_days: int) -> YahooSnapshot:
+    return fetch_snapshot(ticker, lookback_days=lookback_days)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_chart(ticker: str, lookback_days: int, ma_windows: tuple[int, ...], volume_avg_window: int) -> ChartData:
+    snap = _cached_snapshot(ticker, lookback_days)
+    return prepare_chart_data(snap.history, ma_windows=ma_windows, volume_avg_window=volume_avg_window)
+
+
+def _history_key(ticker: str, lookback_days: int, snap: YahooSnapshot) -> tuple:
+    # Cheap identity for a fetched history: a refreshed fetch changes the last bar (or its close/volume).
+    hist = snap.history
+    if hist.empty:
+        return (ticker, lookback_days, 0)
+    return (ticker, lookback_days, len(hist), hist.index[-1], float(hist["Close"].iloc[-1]), float(hist["Volume"].iloc[-1]))
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def _cached_laowang(
+    history_key: tuple, _snap: YahooSnapshot, lookback_days: int, vol_window: int
+) -> tuple[GapStatus, ReclaimSignal, MassiveVolumeLevel, BearishOmens]:
+    hist, arrays = _snap.history, _snap.arrays
+    gap = detect_last_gap(hist, gap_threshold=0.0, lookback_days=lookback_days, arrays=arrays)
+    reclaim = gap_reclaim_within_3_days(gap, hist, arrays=arrays)
+    mv = massive_volume_levels(hist, lookback_days=vol_window, arrays=arrays)
+    omen = bearish_omens(hist, vol_avg_window=vol_window, arrays=arrays)
+    return gap, reclaim, mv, omen
+
+
+def _dir_mtime(report_dir: Path) -> float:
+    try:
+        return report_dir.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+# A directory's mtime changes when reports are added or removed; the short TTL covers in-place overwrites.
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_list_reports(report_dir: str, dir_mtime: float) -> list[ReportFile]:
+    return list_reports(Path(report_dir))
+
+
+# Keyed on mtime so a regenerated report (same file name) is re-read.
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_report_text(path: str, mtime: float) -> str:
+    return read_text(Path(path))
+
+
+# go.Figure is large and mutable, so it is cached as a resource. `chart_key` identifies the data
+# (ticker, lookback, shown range, latest bar); the frame itself is not hashed.
+@st.cache_resource(ttl=300, max_entries=16, show_spinner=False)
+def _build_fig(
+    chart_key: tuple,
+    _df: pd.DataFrame,
+    ma_windows: tuple[int, ...],
+    vol_window: int,
+    gap_levels: tuple[float, float] | None,
+    mv_levels: tuple[float | None, float | None],
+) -> go.Figure:
+    df = _df  # leading underscore: Streamlit skips hashing this argument
+    fig = make_subplots(
+        rows=2,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.02,
+        row_heights=[0.72, 0.28],
+    )
+
+    fig.add_trace(
+        go.Candlestick(
+            x=df.index,
+            open=df["Open"],
+            high=df["High"],
+            low=df["Low"],
+            close=df["Close"],
+            name="Daily",
+        ),
+        row=1,
+        col=1,
+    )
+
+    # 老王: horizontal levels
+    if gap_levels is not None:
+        fig.add_hline(y=float(gap_levels[0]), line_width=1, line_dash="dot", line_color="#7f7f7f", annotation_text="Gap lower", row=1, col=1)
+        fig.add_hline(y=float(gap_levels[1]), line_width=1, line_dash="dot", line_color="#7f7f7f", annotation_text="Gap upper", row=1, col=1)
+
+    # Massive volume levels
+    if mv_levels[0] is not None:
+        fig.add_hline(y=float(mv_levels[0]), line_width=1.5, line_dash="dash", line_color="red", annotation_text="Massive vol low", row=1, col=1)
+    if mv_levels[1] is not None:
+        fig.add_hline(y=float(mv_levels[1]), line_width=1.5, line_dash="dash", line_color="green", annotation_text="Massive vol high", row=1, col=1)
+
+    for w in ma_windows:
+        col = f"MA{w}"
+        if col in df.columns:
+            fig.add_trace(
+                go.Scatter(
+                    x=df.index,
+                    y=df[col],
+                    mode="lines",
+                    name=col,
+                    line=dict(width=1.5),
+                ),
+                row=1,
+                col=1,
+            )
+
+    fig.add_trace(
+        go.Bar(
+            x=df.index,
+            y=df["Volume"],
+            name="Volume",
+            marker=dict(color="rgba(120,120,120,0.6)"),
+        ),
+        row=2,
+        col=1,
+    )
+
+    vavg_col = f"VAVG{vol_window}"
+    if vavg_col in df.columns:
+        fig.add_trace(
+            go.Scatter(
+                x=df.index,
+                y=df[vavg_col],
+                mode="lines",
+                name=vavg_col,
+                line=dict(width=1.5, color="orange"),
+            ),
+            row=2,
+            col=1,
+        )
+
+    fig.update_layout(
+        height=720,
+        margin=dict(l=10, r=10, t=30, b=10),
+        hovermode="x unified",
+        xaxis_rangeslider_visible=False,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+    )
+    fig.update_yaxes(title_text="Price", row=1, col=1)
+    fig.update_yaxes(title_text="Volume", row=2, col=1)
+    return fig
+
+
 def main() -> None:
     st.set_page_config(page_title="ETF Dashboard", layout="wide")
 
@@ -54,9 +212,18 @@ def main() -> None:
         out_dir = st.text_input("Reports directory", value=default_out_dir)
 
         benchmark = st.text_input("Benchmark", value="^GSPC")
-        lookback = st.number_input("Lookback (days)", min_value=200, max_value=2000, value=400, step=50)
+        lookback = st.number_input("Lookback (days)", min_value=200, max_value=2000, value=365, step=50)
         vol_window = st.number_input("Volume avg window", min_value=5, max_value=120, value=20, step=5)
 
+        # One snapshot per rerun serves both the date-range picker and the chart below.
+        chart_ticker = ticker.strip() or "VOO"
+        snap = None
+        snap_error: Exception | None = None
+        try:
+            snap = _cached_snapshot(chart_ticker, int(lookback))
+        except Exception as e:
+            snap_error = e
+
         st.header("Chart")
         chart_mode = st.radio(
             "Date range mode",
@@ -65,17 +232,11 @@ def main() -> None:
             horizontal=True,
         )
 
-        snap_for_dates = None
-        if chart_mode == "Custom":
-            try:
-                snap_for_dates = fetch_snapshot(ticker.strip() or "VOO", lookback_days=int(lookback))
-            except Exception:
-                snap_for_dates = None
-
-        if chart_mode == "Custom" and snap_for_dates is not None and not snap_for_dates.history.empty:
-            df_idx = pd.to_datetime(snap_for_dates.history.index)
-            min_date = df_idx.min().date()
-            max_date = df_idx.max().date()
+        if chart_mode == "Custom" and snap is not None and not snap.history.empty:
+            # Yahoo history comes back as an ascending DatetimeIndex: the ends are the range.
+            df_idx = snap.history.index
+            min_date = df_idx[0].date()
+            max_date = df_idx[-1].date()
             start_date, end_date = st.date_input(
                 "Chart date range",
                 value=(min_date, max_date),
@@ -96,7 +257,7 @@ def main() -> None:
 
         ma_windows = st.multiselect(
             "Moving averages",
-            options=[5, 10, 20, 50, 60, 150, 200],
+            options=list(MA_WINDOWS),
             default=[5, 10, 20, 50, 200],
         )
 
@@ -120,26 +281,18 @@ def main() -> None:
     # Chart (interactive)
     st.subheader("Chart")
     try:
-        snap = fetch_snapshot(ticker.strip() or "VOO", lookback_days=int(lookback))
-        chart = prepare_chart_data(
-            snap.history,
-            ma_windows=[int(x) for x in ma_windows],
-            volume_avg_window=int(vol_window),
-        )
+        if snap is None:
+            raise snap_error or RuntimeError(f"No snapshot for {chart_ticker}")
+        chart = _cached_chart(chart_ticker, int(lookback), tuple(int(x) for x in ma_windows), int(vol_window))
 
         # 老王 overlay levels
-        from etf_dashboard.laowang import (
-            bearish_omens,
-            detect_last_gap,
-            gap_reclaim_within_3_days,
-            massive_volume_levels,
+        gap, reclaim, mv, omen = _cached_laowang(
+            _history_key(chart_ticker, int(lookback), snap),
+            snap,
+            int(laowang_lookback),
+            int(vol_window),
         )
 
-        gap = detect_last_gap(snap.history, gap_threshold=0.0, lookback_days=int(laowang_lookback))
-        reclaim = gap_reclaim_within_3_days(gap, snap.history)
-        mv = massive_volume_levels(snap.history, lookback_days=int(vol_window))
-        omen = bearish_omens(snap.history, vol_avg_window=int(vol_window))
-
         st.caption(
             "老王："
             f"gap={gap.last_gap.kind if gap.last_gap else 'MISSING'} zone=[{gap.last_gap.lower if gap.last_gap else 'MISSING'}, {gap.last_gap.upper if gap.last_gap else 'MISSING'}] | "
@@ -153,93 +306,32 @@ def main() -> None:
         if start_date is not None and end_date is not None:
             # st.date_input can return a single date if user clears one side
             if isinstance(start_date, date) and isinstance(end_date, date):
-                df_show = df.loc[(df.index.date >= start_date) & (df.index.date <= end_date)].copy()
+                # Binary-search local-midnight bounds on the sorted index instead of comparing boxed dates.
+                lo = df.index.searchsorted(pd.Timestamp(start_date, tz=df.index.tz))
+                hi = df.index.searchsorted(pd.Timestamp(end_date + timedelta(days=1), tz=df.index.tz))
+                df_show = df.iloc[lo:hi]
             else:
-                df_show = df.tail(int(min(180, len(df)))).copy()
+                df_show = df.tail(int(min(180, len(df))))
         else:
-            df_show = df.tail(int(chart_range)).copy()
-
-        fig = make_subplots(
-            rows=2,
-            cols=1,
-            shared_xaxes=True,
-            vertical_spacing=0.02,
-            row_heights=[0.72, 0.28],
-        )
-
-        fig.add_trace(
-            go.Candlestick(
-                x=df_show.index,
-                open=df_show["Open"],
-                high=df_show["High"],
-                low=df_show["Low"],
-                close=df_show["Close"],
-                name="Daily",
-            ),
-            row=1,
-            col=1,
-        )
-
-        # 老王: horizontal levels
-        if gap.last_gap is not None:
-            fig.add_hline(y=float(gap.last_gap.lower), line_width=1, line_dash="dot", line_color="#7f7f7f", annotation_text="Gap lower", row=1, col=1)
-            fig.add_hline(y=float(gap.last_gap.upper), line_width=1, line_dash="dot", line_color="#7f7f7f", annotation_text="Gap upper", row=1, col=1)
-
-        # Massive volume levels
-        if mv.low is not None:
-            fig.add_hline(y=float(mv.low), line_width=1.5, line_dash="dash", line_color="red", annotation_text="Massive vol low", row=1, col=1)
-        if mv.high is not None:
-            fig.add_hline(y=float(mv.high), line_width=1.5, line_dash="dash", line_color="green", annotation_text="Massive vol high", row=1, col=1)
-
-        for w in [int(x) for x in ma_windows]:
-            col = f"MA{w}"
-            if col in df_show.columns:
-                fig.add_trace(
-                    go.Scatter(
-                        x=df_show.index,
-                        y=df_show[col],
-                        mode="lines",
-                        name=col,
-                        line=dict(width=1.5),
-                    ),
-                    row=1,
-                    col=1,
-                )
-
-        fig.add_trace(
-            go.Bar(
-                x=df_show.index,
-                y=df_show["Volume"],
-                name="Volume",
-                marker=dict(color="rgba(120,120,120,0.6)"),
-            ),
-            row=2,
-            col=1,
+            df_show = df.tail(int(chart_range))
+
+        chart_key = (
+            chart_ticker,
+            int(lookback),
+            len(df_show),
+            df_show.index[0] if len(df_show) else None,
+            df_show.index[-1] if len(df_show) else None,
+            float(df_show["Close"].iloc[-1]) if len(df_show) else None,
+            float(df_show["Volume"].iloc[-1]) if len(df_show) else None,
         )
-
-        vavg_col = f"VAVG{int(vol_window)}"
-        if vavg_col in df_show.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df_show.index,
-                    y=df_show[vavg_col],
-                    mode="lines",
-                    name=vavg_col,
-                    line=dict(width=1.5, color="orange"),
-                ),
-                row=2,
-                col=1,
-            )
-
-        fig.update_layout(
-            height=720,
-            margin=dict(l=10, r=10, t=30, b=10),
-            hovermode="x unified",
-            xaxis_rangeslider_visible=False,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+        fig = _build_fig(
+            chart_key,
+            df_show,
+            tuple(int(x) for x in ma_windows),
+            int(vol_window),
+            (float(gap.last_gap.lower), float(gap.last_gap.upper)) if gap.last_gap is not None else None,
+            (mv.low, mv.high),
         )
-        fig.update_yaxes(title_text="Price", row=1, col=1)
-        fig.update_yaxes(title_text="Volume", row=2, col=1)
 
         st.plotly_chart(fig, use_container_width=True)
     except Exception as e:
@@ -277,7 +369,8 @@ def main() -> None:
 
     st.subheader("Reports")
 
-    files = list_reports(report_dir)
+    # A report generated in this run must show up (and may overwrite one with the same name).
+    files = list_reports(report_dir) if run else _cached_list_reports(str(report_dir), _dir_mtime(report_dir))
     if not files:
         st.info(f"No reports found in {report_dir.resolve()}")
         return
@@ -285,18 +378,19 @@ def main() -> None:
     options = {f"{f.name}  ({datetime.fromtimestamp(f.mtime).strftime('%Y-%m-%d %H:%M:%S')})": f for f in files}
     selected_label = st.selectbox("Select a report", list(options.keys()))
     selected = options[selected_label]
+    text = _cached_report_text(str(selected.path), selected.mtime)
 
     c1, c2 = st.columns([3, 1])
     with c2:
         st.download_button(
             label="Download Markdown",
-            data=read_text(selected.path),
+            data=text,
             file_name=selected.name,
             mime="text/markdown",
         )
 
     with c1:
-        st.markdown(read_text(selected.path))
+        st.markdown(text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryArrays:
+    """Columnar (SoA) float64 view of a daily OHLCV history.
+
+    Built once per snapshot so the numeric code does not repeatedly pull
+    `hist["X"].astype(float)` out of the DataFrame.
+
+    `dates` holds the bar dates as naive datetime64 in the exchange's local
+    wall-clock time (tz dropped), so calendar dates match `Timestamp.date()`.
+    """
+
+    dates: np.ndarray
+    open_: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_frame(cls, hist: pd.DataFrame) -> HistoryArrays:
+        idx = pd.DatetimeIndex(hist.index)
+        if idx.tz is not None:
+            idx = idx.tz_localize(None)
+        return cls(
+            dates=idx.to_numpy(),
+            open_=np.ascontiguousarray(hist["Open"].to_numpy(dtype=np.float64)),
+            high=np.ascontiguousarray(hist["High"].to_numpy(dtype=np.float64)),
+            low=np.ascontiguousarray(hist["Low"].to_numpy(dtype=np.float64)),
+            close=np.ascontiguousarray(hist["Close"].to_numpy(dtype=np.float64)),
+            volume=np.ascontiguousarray(hist["Volume"].to_numpy(dtype=np.float64)),
+        )
+
+    def __len__(self) -> int:
+        return int(self.close.shape[0])
+
+    def tail(self, n: int) -> HistoryArrays:
+        """Last `n` bars as views (no copy), like `DataFrame.tail(n)`."""
+        start = max(len(self) - int(n), 0)
+        return HistoryArrays(
+            dates=self.dates[start:],
+            open_=self.open_[start:],
+            high=self.high[start:],
+            low=self.low[start:],
+            close=self.close[start:],
+            volume=self.volume[start:],
+        )
@@ -5,6 +5,13 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 
+from ._kernels import last_valid
+from ._kernels import sma_multi as _sma_multi
+
+
+# MA windows shown on the chart and reported by the CLI.
+MA_WINDOWS: tuple[int, ...] = (5, 10, 20, 50, 60, 150, 200)
+
 
 @dataclass(frozen=True)
 class Macd:
@@ -13,9 +20,16 @@ class Macd:
     hist: float
 
 
+def _as_f64(s: pd.Series) -> np.ndarray:
+    """Contiguous float64 buffer for the kernels (no copy when the Series already is one)."""
+    a = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    return a if a.flags.c_contiguous else np.ascontiguousarray(a)
+
+
 def sma(close: pd.Series, window: int) -> pd.Series:
-    """Simple moving average."""
-    return close.rolling(window=window, min_periods=window).mean()
+    """Simple moving average (same NaN rules as `rolling(window, min_periods=window).mean()`)."""
+    out = _sma_multi(_as_f64(close), (int(window),))[:, 0]
+    return pd.Series(out, index=close.index, name=close.name)
 
 
 def rsi(close: pd.Series, period: int = 14) -> pd.Series:
@@ -45,10 +59,8 @@ def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> p
 
 
 def latest_value(series: pd.Series) -> float | None:
-    s = series.dropna()
-    if s.empty:
-        return None
-    return float(s.iloc[-1])
+    # Reverse scan of the float buffer; no dropna() copy of the whole series.
+    return last_valid(_as_f64(series))
 
 
 def pct(a: float, b: float) -> float:
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
+from ._kernels import window_mean
+from .history import HistoryArrays
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class GapEvent:
     kind: str  # 'GAP_UP' | 'GAP_DOWN'
     date: str
@@ -14,7 +19,7 @@ class GapEvent:
     upper: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GapStatus:
     """Track the latest *effective* gap within lookback_days.
 
@@ -41,13 +46,13 @@ class GapStatus:
     reclaim_level: float | None  # up_gap_upper = Low[gap_day]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IslandReversal:
     start_gap_up: GapEvent
     end_gap_down: GapEvent
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReclaimSignal:
     is_reclaim: bool | None
     reclaim_date: str | None
@@ -55,14 +60,14 @@ class ReclaimSignal:
     reclaim_level: float | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BearishOmens:
     long_black_engulf: bool | None
     price_up_vol_down: bool | None
     distribution_day: bool | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MassiveVolumeLevel:
     """爆量K棒防守/壓力 (massive volume level).
 
@@ -88,6 +93,9 @@ class MassiveVolumeLevel:
 
 def _to_date_str(idx) -> str:
     # yfinance uses Timestamp index; keep report stable with ISO date.
+    if isinstance(idx, np.datetime64):
+        # HistoryArrays dates: truncating to the day formats as ISO without building a Timestamp.
+        return str(idx.astype("datetime64[D]"))
     try:
         return pd.Timestamp(idx).date().isoformat()
     except Exception:
@@ -99,7 +107,18 @@ def _required_columns(hist: pd.DataFrame) -> bool:
     return req.issubset(set(hist.columns))
 
 
-def detect_last_gap(hist: pd.DataFrame, gap_threshold: float = 0.003, lookback_days: int = 60) -> GapStatus:
+def _arrays(hist: pd.DataFrame, arrays: HistoryArrays | None) -> HistoryArrays:
+    # Callers that already hold the snapshot's columnar arrays pass them in; otherwise build once here.
+    return arrays if arrays is not None else HistoryArrays.from_frame(hist)
+
+
+def detect_last_gap(
+    hist: pd.DataFrame,
+    gap_threshold: float = 0.003,
+    lookback_days: int = 60,
+    *,
+    arrays: HistoryArrays | None = None,
+) -> GapStatus:
     """Detect the latest *effective* strict gap (no threshold) within lookback_days.
 
     Spec:
@@ -129,8 +148,8 @@ def detect_last_gap(hist: pd.DataFrame, gap_threshold: float = 0.003, lookback_d
             reclaim_level=None,
         )
 
-    df = hist[["Open", "High", "Low", "Close", "Volume"]].astype(float).tail(max(int(lookback_days) + 2, 10)).copy()
-    if len(df) < 2:
+    a = _arrays(hist, arrays).tail(max(int(lookback_days) + 2, 10))
+    if len(a) < 2:
         return GapStatus(
             last_gap=None,
             lookback_days=int(lookback_days),
@@ -141,41 +160,39 @@ def detect_last_gap(hist: pd.DataFrame, gap_threshold: float = 0.003, lookback_d
             reclaim_level=None,
         )
 
-    df.index = pd.to_datetime(df.index)
-    highs = df["High"].to_numpy()
-    lows = df["Low"].to_numpy()
+    dates = a.dates
+    highs = a.high
+    lows = a.low
+    closes = a.close
 
     last_gap: GapEvent | None = None
     last_i: int | None = None
 
-    start = max(1, len(df) - int(lookback_days))
-    for i in range(start, len(df)):
-        prev_high = float(highs[i - 1])
-        prev_low = float(lows[i - 1])
-        hi = float(highs[i])
-        lo = float(lows[i])
+    # Bar i (i >= start) against bar i-1, all at once; NaN compares False as in the scalar test.
+    start = max(1, len(a) - int(lookback_days))
+    is_up = lows[start:] > highs[start - 1 : -1]  # strict gap_up
+    is_down = highs[start:] < lows[start - 1 : -1]  # strict gap_down
+    hits = np.flatnonzero(is_up | is_down)
 
-        # strict gap_up
-        if lo > prev_high:
+    if hits.size:
+        k = int(hits[-1])
+        last_i = start + k
+        if is_up[k]:
             last_gap = GapEvent(
                 kind="GAP_UP",
-                date=_to_date_str(df.index[i]),
-                prev_date=_to_date_str(df.index[i - 1]),
-                lower=prev_high,  # up_gap_bottom
-                upper=lo,  # up_gap_upper
+                date=_to_date_str(dates[last_i]),
+                prev_date=_to_date_str(dates[last_i - 1]),
+                lower=float(highs[last_i - 1]),  # up_gap_bottom
+                upper=float(lows[last_i]),  # up_gap_upper
             )
-            last_i = i
-
-        # strict gap_down
-        elif hi < prev_low:
+        else:
             last_gap = GapEvent(
                 kind="GAP_DOWN",
-                date=_to_date_str(df.index[i]),
-                prev_date=_to_date_str(df.index[i - 1]),
-                lower=hi,  # down_gap_bottom
-                upper=prev_low,  # down_gap_top
+                date=_to_date_str(dates[last_i]),
+                prev_date=_to_date_str(dates[last_i - 1]),
+                lower=float(highs[last_i]),  # down_gap_bottom
+                upper=float(lows[last_i - 1]),  # down_gap_top
             )
-            last_i = i
 
     if last_gap is None or last_i is None:
         return GapStatus(
@@ -189,9 +206,8 @@ def detect_last_gap(hist: pd.DataFrame, gap_threshold: float = 0.003, lookback_d
         )
 
     # expiration
-    latest_date = pd.Timestamp(df.index[-1]).date()
-    gap_date = pd.Timestamp(df.index[last_i]).date()
-    is_expired = (latest_date - gap_date).days > int(lookback_days)
+    age_days = int((dates[-1].astype("datetime64[D]") - dates[last_i].astype("datetime64[D]")).astype(np.int64))
+    is_expired = age_days > int(lookback_days)
     if is_expired:
         return GapStatus(
             last_gap=None,
@@ -207,26 +223,22 @@ def detect_last_gap(hist: pd.DataFrame, gap_threshold: float = 0.003, lookback_d
     fill_date_by_close: str | None = None
     fill_close_by_close: float | None = None
 
+    after = closes[last_i + 1 :]
     if last_gap.kind == "GAP_UP":
         fill_level = float(last_gap.lower)  # up_gap_bottom
         reclaim_level = float(last_gap.upper)  # up_gap_upper
-        for j in range(last_i + 1, len(df)):
-            c = float(df["Close"].iloc[j])
-            if c <= fill_level:
-                is_filled_by_close = True
-                fill_date_by_close = _to_date_str(df.index[j])
-                fill_close_by_close = c
-                break
+        filled = np.flatnonzero(after <= fill_level)
     else:
         fill_level = float(last_gap.upper)  # down_gap_top
         reclaim_level = None
-        for j in range(last_i + 1, len(df)):
-            c = float(df["Close"].iloc[j])
-            if c >= fill_level:
-                is_filled_by_close = True
-                fill_date_by_close = _to_date_str(df.index[j])
-                fill_close_by_close = c
-                break
+        filled = np.flatnonzero(after >= fill_level)
+
+    # First close at/through the edge after the gap day.
+    if filled.size:
+        j = last_i + 1 + int(filled[0])
+        is_filled_by_close = True
+        fill_date_by_close = _to_date_str(dates[j])
+        fill_close_by_close = float(closes[j])
 
     return GapStatus(
         last_gap=last_gap,
@@ -239,12 +251,47 @@ def detect_last_gap(hist: pd.DataFrame, gap_threshold: float = 0.003, lookback_d
     )
 
 
+def _gap_masks(highs: np.ndarray, lows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-bar strict gap flags: up = Low[t] > High[t-1], down = High[t] < Low[t-1] (bar 0 never gaps)."""
+    n = highs.shape[0]
+    is_up = np.zeros(n, dtype=bool)
+    is_down = np.zeros(n, dtype=bool)
+    is_up[1:] = lows[1:] > highs[:-1]
+    is_down[1:] = highs[1:] < lows[:-1]
+    return is_up, is_down
+
+
+def _last_island(
+    first: np.ndarray,
+    second: np.ndarray,
+    min_sep: int,
+    max_sep: int,
+    overlaps,
+) -> tuple[int, int] | None:
+    """Latest (i, j) with a `first` gap at i and a `second` gap at j in [i+min_sep, i+max_sep].
+
+    The nested scan this replaces kept the last match, i.e. the largest i and,
+    for that i, the largest j; walking both gap lists backwards returns it first.
+    """
+    n = first.shape[0]
+    second_idx = np.flatnonzero(second)
+    for i in np.flatnonzero(first[: n - 1])[::-1].tolist():
+        lo = np.searchsorted(second_idx, i + min_sep, side="left")
+        hi = np.searchsorted(second_idx, min(n - 1, i + max_sep), side="right")
+        for j in second_idx[lo:hi][::-1].tolist():
+            if overlaps(i, j):
+                return i, j
+    return None
+
+
 def detect_island_reversal(
     hist: pd.DataFrame,
     gap_threshold: float = 0.003,
     min_separation_days: int = 2,
     max_separation_days: int = 10,
     lookback_days: int = 120,
+    *,
+    arrays: HistoryArrays | None = None,
 ) -> IslandReversal | None:
     """Detect *bearish* island reversal using strict gaps.
 
@@ -265,54 +312,42 @@ def detect_island_reversal(
     if hist is None or hist.empty or not _required_columns(hist):
         return None
 
-    df = hist[["Open", "High", "Low", "Close", "Volume"]].astype(float).tail(max(int(lookback_days) + 2, 20)).copy()
-    if len(df) < 3:
+    a = _arrays(hist, arrays).tail(max(int(lookback_days) + 2, 20))
+    if len(a) < 3:
         return None
 
-    df.index = pd.to_datetime(df.index)
-    highs = df["High"].to_numpy()
-    lows = df["Low"].to_numpy()
-
-    latest: IslandReversal | None = None
-
-    for i in range(1, len(df) - 1):
-        prev_high = float(highs[i - 1])
-        lo = float(lows[i])
-        if not (lo > prev_high):
-            continue
-
-        gap_up = GapEvent(
-            kind="GAP_UP",
-            date=_to_date_str(df.index[i]),
-            prev_date=_to_date_str(df.index[i - 1]),
-            lower=prev_high,
-            upper=lo,
-        )
-
-        start_j = i + int(min_separation_days)
-        end_j = min(len(df) - 1, i + int(max_separation_days))
-        if start_j >= len(df):
-            continue
-
-        for j in range(start_j, end_j + 1):
-            prev_low = float(lows[j - 1])
-            hi = float(highs[j])
-            if not (hi < prev_low):
-                continue
-
-            gap_down = GapEvent(
-                kind="GAP_DOWN",
-                date=_to_date_str(df.index[j]),
-                prev_date=_to_date_str(df.index[j - 1]),
-                lower=hi,
-                upper=prev_low,
-            )
-
-            # overlap/return into prior gap zone
-            if float(gap_down.upper) >= float(gap_up.lower):
-                latest = IslandReversal(start_gap_up=gap_up, end_gap_down=gap_down)
+    dates = a.dates
+    highs = a.high
+    lows = a.low
+
+    is_up, is_down = _gap_masks(highs, lows)
+    hit = _last_island(
+        is_up,
+        is_down,
+        int(min_separation_days),
+        int(max_separation_days),
+        # overlap/return into prior gap zone: gap_down.upper >= gap_up.lower
+        lambda i, j: lows[j - 1] >= highs[i - 1],
+    )
+    if hit is None:
+        return None
 
-    return latest
+    i, j = hit
+    gap_up = GapEvent(
+        kind="GAP_UP",
+        date=_to_date_str(dates[i]),
+        prev_date=_to_date_str(dates[i - 1]),
+        lower=float(highs[i - 1]),
+        upper=float(lows[i]),
+    )
+    gap_down = GapEvent(
+        kind="GAP_DOWN",
+        date=_to_date_str(dates[j]),
+        prev_date=_to_date_str(dates[j - 1]),
+        lower=float(highs[j]),
+        upper=float(lows[j - 1]),
+    )
+    return IslandReversal(start_gap_up=gap_up, end_gap_down=gap_down)
 
 
 def detect_island_reversal_bullish(
@@ -321,6 +356,8 @@ def detect_island_reversal_bullish(
     min_separation_days: int = 2,
     max_separation_days: int = 10,
     lookback_days: int = 120,
+    *,
+    arrays: HistoryArrays | None = None,
 ) -> IslandReversal | None:
     """Detect *bullish* island reversal using strict gaps.
 
@@ -341,57 +378,50 @@ def detect_island_reversal_bullish(
     if hist is None or hist.empty or not _required_columns(hist):
         return None
 
-    df = hist[["Open", "High", "Low", "Close", "Volume"]].astype(float).tail(max(int(lookback_days) + 2, 20)).copy()
-    if len(df) < 3:
+    a = _arrays(hist, arrays).tail(max(int(lookback_days) + 2, 20))
+    if len(a) < 3:
         return None
 
-    df.index = pd.to_datetime(df.index)
-    highs = df["High"].to_numpy()
-    lows = df["Low"].to_numpy()
-
-    latest: IslandReversal | None = None
-
-    for i in range(1, len(df) - 1):
-        prev_low = float(lows[i - 1])
-        hi = float(highs[i])
-        if not (hi < prev_low):
-            continue
-
-        gap_down = GapEvent(
-            kind="GAP_DOWN",
-            date=_to_date_str(df.index[i]),
-            prev_date=_to_date_str(df.index[i - 1]),
-            lower=hi,
-            upper=prev_low,
-        )
-
-        start_j = i + int(min_separation_days)
-        end_j = min(len(df) - 1, i + int(max_separation_days))
-        if start_j >= len(df):
-            continue
-
-        for j in range(start_j, end_j + 1):
-            prev_high = float(highs[j - 1])
-            lo = float(lows[j])
-            if not (lo > prev_high):
-                continue
-
-            gap_up = GapEvent(
-                kind="GAP_UP",
-                date=_to_date_str(df.index[j]),
-                prev_date=_to_date_str(df.index[j - 1]),
-                lower=prev_high,
-                upper=lo,
-            )
-
-            # overlap/return into prior gap zone
-            if float(gap_up.lower) <= float(gap_down.upper):
-                latest = IslandReversal(start_gap_up=gap_up, end_gap_down=gap_down)
+    dates = a.dates
+    highs = a.high
+    lows = a.low
+
+    is_up, is_down = _gap_masks(highs, lows)
+    hit = _last_island(
+        is_down,
+        is_up,
+        int(min_separation_days),
+        int(max_separation_days),
+        # overlap/return into prior gap zone: gap_up.lower <= gap_down.upper
+        lambda i, j: highs[j - 1] <= lows[i - 1],
+    )
+    if hit is None:
+        return None
 
-    return latest
+    i, j = hit
+    gap_down = GapEvent(
+        kind="GAP_DOWN",
+        date=_to_date_str(dates[i]),
+        prev_date=_to_date_str(dates[i - 1]),
+        lower=float(highs[i]),
+        upper=float(lows[i - 1]),
+    )
+    gap_up = GapEvent(
+        kind="GAP_UP",
+        date=_to_date_str(dates[j]),
+        prev_date=_to_date_str(dates[j - 1]),
+        lower=float(highs[j - 1]),
+        upper=float(lows[j]),
+    )
+    return IslandReversal(start_gap_up=gap_up, end_gap_down=gap_down)
 
 
-def gap_reclaim_within_3_days(gap: GapStatus, hist: pd.DataFrame) -> ReclaimSignal:
+def gap_reclaim_within_3_days(
+    gap: GapStatus,
+    hist: pd.DataFrame,
+    *,
+    arrays: HistoryArrays | None = None,
+) -> ReclaimSignal:
     """假跌破收復 (buy): after a GAP_UP is filled-by-close, within 3 trading days close reclaims gap upper edge."""
     if gap.last_gap is None or gap.is_filled_by_close is None:
         return ReclaimSignal(is_reclaim=None, reclaim_date=None, days_since_fill=None, reclaim_level=None)
@@ -410,46 +440,47 @@ def gap_reclaim_within_3_days(gap: GapStatus, hist: pd.DataFrame) -> ReclaimSign
 
     reclaim_level = float(gap.last_gap.upper)
 
-    df = hist[["Close"]].astype(float).copy()
-    df.index = pd.to_datetime(df.index)
+    a = _arrays(hist, arrays)
+    dates = a.dates
+    closes = a.close
 
-    fill_date_iso = pd.Timestamp(gap.fill_date_by_close).date().isoformat()
-    fill_pos = None
-    for i, idx in enumerate(df.index):
-        if pd.Timestamp(idx).date().isoformat() == fill_date_iso:
-            fill_pos = i
-            break
-
-    if fill_pos is None:
+    # First bar on the fill date: bar dates are ascending, so a binary search on the day replaces the scan.
+    fill_day = np.datetime64(pd.Timestamp(gap.fill_date_by_close).date().isoformat(), "D")
+    days = dates.astype("datetime64[D]")
+    fill_pos = int(np.searchsorted(days, fill_day, side="left"))
+    if fill_pos >= len(a) or days[fill_pos] != fill_day:
         return ReclaimSignal(is_reclaim=None, reclaim_date=None, days_since_fill=None, reclaim_level=reclaim_level)
 
-    for d in range(1, 4):
-        j = fill_pos + d
-        if j >= len(df):
-            break
-        if float(df["Close"].iloc[j]) >= reclaim_level:
-            return ReclaimSignal(
-                is_reclaim=True,
-                reclaim_date=_to_date_str(df.index[j]),
-                days_since_fill=d,
-                reclaim_level=reclaim_level,
-            )
+    reclaimed = np.flatnonzero(closes[fill_pos + 1 : fill_pos + 4] >= reclaim_level)
+    if reclaimed.size:
+        d = int(reclaimed[0]) + 1
+        return ReclaimSignal(
+            is_reclaim=True,
+            reclaim_date=_to_date_str(dates[fill_pos + d]),
+            days_since_fill=d,
+            reclaim_level=reclaim_level,
+        )
 
     return ReclaimSignal(is_reclaim=False, reclaim_date=None, days_since_fill=None, reclaim_level=reclaim_level)
 
 
 
-def bearish_omens(hist: pd.DataFrame, vol_avg_window: int = 20) -> BearishOmens:
+def bearish_omens(
+    hist: pd.DataFrame,
+    vol_avg_window: int = 20,
+    *,
+    arrays: HistoryArrays | None = None,
+) -> BearishOmens:
     """凶多吉少 detectors (minimal deterministic set)."""
     if hist is None or hist.empty or not _required_columns(hist):
         return BearishOmens(long_black_engulf=None, price_up_vol_down=None, distribution_day=None)
 
-    df = hist[["Open", "High", "Low", "Close", "Volume"]].astype(float).copy()
-    if len(df) < 2:
+    a = _arrays(hist, arrays)
+    if len(a) < 2:
         return BearishOmens(long_black_engulf=None, price_up_vol_down=None, distribution_day=None)
 
-    o0, h0, l0, c0 = (float(df[x].iloc[-1]) for x in ("Open", "High", "Low", "Close"))
-    o1, c1 = (float(df[x].iloc[-2]) for x in ("Open", "Close"))
+    o0, h0, l0, c0 = (float(x[-1]) for x in (a.open_, a.high, a.low, a.close))
+    o1, c1 = (float(x[-2]) for x in (a.open_, a.close))
 
     rng0 = h0 - l0
     body0 = o0 - c0
@@ -458,9 +489,9 @@ def bearish_omens(hist: pd.DataFrame, vol_avg_window: int = 20) -> BearishOmens:
     # 凶多吉少 (新版 spec): 一記重錘破三線
     # - 需要長黑 K
     # - 需要收盤價同時跌破 MA5/MA10/MA20
-    ma5 = float(df["Close"].rolling(window=5, min_periods=5).mean().iloc[-1]) if len(df) >= 5 else None
-    ma10 = float(df["Close"].rolling(window=10, min_periods=10).mean().iloc[-1]) if len(df) >= 10 else None
-    ma20 = float(df["Close"].rolling(window=20, min_periods=20).mean().iloc[-1]) if len(df) >= 20 else None
+    ma5 = window_mean(a.close, 5)
+    ma10 = window_mean(a.close, 10)
+    ma20 = window_mean(a.close, 20)
 
     break_3ma = (
         (ma5 is not None)
@@ -473,11 +504,13 @@ def bearish_omens(hist: pd.DataFrame, vol_avg_window: int = 20) -> BearishOmens:
 
     long_black_engulf = bool(long_black and break_3ma)
 
-    price_up_vol_down = bool((c0 > c1) and (float(df["Volume"].iloc[-1]) < float(df["Volume"].iloc[-2])))
+    price_up_vol_down = bool((c0 > c1) and (float(a.volume[-1]) < float(a.volume[-2])))
 
-    vavg = df["Volume"].rolling(window=int(vol_avg_window), min_periods=int(vol_avg_window)).mean().shift(1)
-    vavg_latest = float(vavg.iloc[-1]) if pd.notna(vavg.iloc[-1]) else None
-    distribution_day = bool((c0 < c1) and (vavg_latest is not None) and (float(df["Volume"].iloc[-1]) >= 1.2 * vavg_latest))
+    # Average volume of the w bars before today (rolling(w).mean().shift(1) at the last bar).
+    vavg_latest = window_mean(a.volume[:-1], int(vol_avg_window))
+    if vavg_latest is not None and np.isnan(vavg_latest):
+        vavg_latest = None
+    distribution_day = bool((c0 < c1) and (vavg_latest is not None) and (float(a.volume[-1]) >= 1.2 * vavg_latest))
 
     return BearishOmens(
         long_black_engulf=long_black_engulf,
@@ -489,6 +522,8 @@ def bearish_omens(hist: pd.DataFrame, vol_avg_window: int = 20) -> BearishOmens:
 def massive_volume_levels(
     hist: pd.DataFrame,
     lookback_days: int = 20,
+    *,
+    arrays: HistoryArrays | None = None,
 ) -> MassiveVolumeLevel:
     """爆量K棒防守/壓力：lookback_days 內最高量。
 
@@ -509,58 +544,59 @@ def massive_volume_levels(
             high_broken=None,
         )
 
-    df = hist[["High", "Low", "Close", "Volume"]].astype(float).copy()
-    df.index = pd.to_datetime(df.index)
+    a = _arrays(hist, arrays)
+    dates = a.dates
+    volume = a.volume
 
     n = int(lookback_days)
-    if len(df) < n:
+    if len(a) < n:
         return MassiveVolumeLevel(
             is_massive=None,
             low=None,
             high=None,
             date=None,
-            vol_today=float(df["Volume"].iloc[-1]) if len(df) else None,
+            vol_today=float(volume[-1]) if len(a) else None,
             vol_max_lookback=None,
             lookback_days=n,
             low_broken=None,
             high_broken=None,
         )
 
-    vmax = df["Volume"].rolling(window=n, min_periods=n).max()
+    # rolling(n, min_periods=n).max(): NaN until n bars, and NaN whenever the window holds a NaN.
+    vmax = np.full(len(a), np.nan)
+    vmax[n - 1 :] = sliding_window_view(volume, n).max(axis=1)
 
+    # Latest bar whose volume equals its window max (NaN windows never match).
     latest_hit_i: int | None = None
-    for i in range(n - 1, len(df)):
-        vol_today = float(df["Volume"].iloc[i])
-        vol_max = float(vmax.iloc[i]) if pd.notna(vmax.iloc[i]) else None
-        if vol_max is None:
-            continue
-        if vol_today == vol_max:
-            latest_hit_i = i
+    hits = np.flatnonzero(volume[n - 1 :] == vmax[n - 1 :])
+    if hits.size:
+        latest_hit_i = n - 1 + int(hits[-1])
 
     if latest_hit_i is None:
         return MassiveVolumeLevel(
             is_massive=False,
             low=None,
             high=None,
-            date=_to_date_str(df.index[-1]),
-            vol_today=float(df["Volume"].iloc[-1]),
-            vol_max_lookback=float(vmax.iloc[-1]) if pd.notna(vmax.iloc[-1]) else None,
+            date=_to_date_str(dates[-1]),
+            vol_today=float(volume[-1]),
+            vol_max_lookback=None if np.isnan(vmax[-1]) else float(vmax[-1]),
             lookback_days=n,
             low_broken=False,
             high_broken=False,
         )
 
-    low = float(df["Low"].iloc[latest_hit_i])
-    high = float(df["High"].iloc[latest_hit_i])
-    c_latest = float(df["Close"].iloc[-1])
+    low = float(a.low[latest_hit_i])
+    high = float(a.high[latest_hit_i])
+    c_latest = float(a.close[-1])
 
     return MassiveVolumeLevel(
         is_massive=True,
         low=low,
         high=high,
-        date=_to_date_str(df.index[latest_hit_i]),
-        vol_today=float(df["Volume"].iloc[latest_hit_i]),
-        vol_max_lookback=float(vmax.iloc[latest_hit_i]) if pd.notna(vmax.iloc[latest_hit_i]) else None,
+        date=_to_date_str(dates[latest_hit_i]),
+        vol_today=float(volume[latest_hit_i]),
+        # A hit means volume == vmax there, so the window max is defined.
+        vol_max_lookback=float(vmax[latest_hit_i]),
         lookback_days=n,
         low_broken=(c_latest < low),
         high_broken=(c_latest > high),
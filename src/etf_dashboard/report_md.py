@@ -20,6 +20,11 @@ def _fmt_num(x: float | None, *, digits: int) -> str:
         return MISSING
     if not isinstance(x, (int, float)):
         raise TypeError(f"Expected number or None, got {type(x).__name__}")
+    # The report only uses 2 and 4 decimals; literal specs skip building the spec string per call.
+    if digits == 2:
+        return f"{x:.2f}"
+    if digits == 4:
+        return f"{x:.4f}"
     return f"{x:.{digits}f}"
 
 
@@ -44,9 +49,18 @@ def fmt_pct(x: float | None, digits: int = 2) -> str:
         return MISSING
     if not isinstance(x, (int, float)):
         raise TypeError(f"Expected number or None, got {type(x).__name__}")
+    if digits == 2:
+        return f"{x:.2f}%"
     return f"{x:.{digits}f}%"
 
 
+def fmt_pct_from_ratio(x: float | None, digits: int = 2) -> str:
+    """Format a 0-1 ratio as a percentage (0.25 -> "25.00%")."""
+    if x is None:
+        return MISSING
+    return fmt_pct(x * 100.0, digits)
+
+
 def _fmt_bool(x: bool | None) -> str:
     """Stable bool formatting for markdown tables.
 
@@ -59,9 +73,8 @@ def _fmt_bool(x: bool | None) -> str:
 
 
 def _fmt_text(x: str | None) -> str:
-    if x is None or x == "":
-        return MISSING
-    return x
+    # None and "" are both falsy.
+    return x or MISSING
 
 
 def _status_trailing_stop(hit: bool | None) -> str:
@@ -216,14 +229,14 @@ class ReportInputs:
 def _render_notes(notes: list[str]) -> str:
     if not notes:
         return "- (none)"
-    # Avoid intermediate list; keep output deterministic.
-    return "\n".join(f"- {n}" for n in notes)
+    # One join with the bullet as separator; no per-note f-string.
+    return "- " + "\n- ".join(notes)
 
 
 def _render_list(items: list[str]) -> str:
     if not items:
         return "- (none)"
-    return "\n".join(f"  - {x}" for x in items)
+    return "  - " + "\n  - ".join(items)
 
 
 
@@ -247,38 +260,63 @@ def render_report_md(inp: ReportInputs) -> str:
 
     ma_guard_status = _status_ma_guard(inp.p_now, inp.ma20)
 
-    kelly_w_pct = fmt_pct((inp.kelly_w * 100.0) if inp.kelly_w is not None else None, 2)
-    kelly_f_capped_pct = fmt_pct((inp.kelly_f_capped * 100.0) if inp.kelly_f_capped is not None else None, 2)
-
-    md = f"""## 🩺 {inp.name or inp.ticker}（{inp.ticker}）雙核實戰診斷書
+    kelly_w_pct = fmt_pct_from_ratio(inp.kelly_w)
+    kelly_f_capped_pct = fmt_pct_from_ratio(inp.kelly_f_capped)
+
+    # Values that appear in more than one section are formatted once.
+    r_ratio = fmt(inp.r_ratio, 4)
+    stop = fmt(inp.stop)
+    target = fmt(inp.target)
+    gap_lower = fmt(inp.gap_lower)
+    gap_upper = fmt(inp.gap_upper)
+    gap_kind = _fmt_text(inp.gap_kind)
+    massive_low = fmt(inp.vol_spike_defense)
+    massive_high = fmt(inp.vol_spike_resistance)
+    low_broken = _fmt_bool(inp.vol_spike_defense_broken)
+    high_broken = _fmt_bool(inp.vol_spike_resistance_broken)
+    vol_ratio = fmt(inp.vol_ratio, 2)
+    macd_hist = fmt(inp.macd_hist)
+    stop_loss_pct = fmt_pct_from_ratio(inp.stop_loss_pct)
+    long_black_engulf = _fmt_bool(inp.bearish_long_black_engulf)
+    san_sheng_wu_nai = _fmt_bool(inp.san_sheng_wu_nai)
+    gap_filled_by_close = _fmt_bool(inp.gap_filled_by_close)
+    gap_fill_date = _fmt_text(inp.gap_fill_date_by_close)
+    gap_reclaim_3d = _fmt_bool(inp.gap_reclaim_3d)
+    gap_reclaim_date = _fmt_text(inp.gap_reclaim_date)
+
+    # One f-string per "###" section, joined once at the end.
+    header = f"""## 🩺 {inp.name or inp.ticker}（{inp.ticker}）雙核實戰診斷書
 
 **報告時間（Local）：** {inp.report_time_local}  \
 **報告時間（UTC）：** {inp.report_time_utc}
 
-### 0. 🔗 資料來源（僅限 Yahoo Finance）
+"""
+    sources = f"""### 0. 🔗 資料來源（僅限 Yahoo Finance）
 - 標的頁：{inp.yahoo_quote_url}
 - 歷史資料頁：{inp.yahoo_history_url}
 - 大盤基準（{inp.benchmark_ticker}）：{inp.benchmark_quote_url}
 - 大盤歷史：{inp.benchmark_history_url}
 
-### 1. 🔍 原始數據驗證表 (Evidence Check)
+"""
+    evidence = f"""### 1. 🔍 原始數據驗證表 (Evidence Check)
 > 結論前請先核對本表；若任一關鍵數值為 {MISSING}，系統將禁止輸出最終操作評級。
 
 | 數據項目 | 系統抓取數值 | 狀態/計算結果 |
 | :--- | :--- | :--- |
 | **最新股價 (P_now)** | {p_now} | 60日乖離率 BIAS_60 = ((P_now - MA60) / MA60) × 100% = {bias60_pct}% |
 | **移動停利 (Trailing stop)** | P_high×(1-{trailing_stop_pct}) = {trailing_stop} | {trailing_stop_status} |
-| **老王：缺口(收盤)/收復/島狀/防守** | gap={_fmt_text(inp.gap_kind)}, zone=[{fmt(inp.gap_lower)},{fmt(inp.gap_upper)}] | filled_by_close={_fmt_bool(inp.gap_filled_by_close)} ({_fmt_text(inp.gap_fill_date_by_close)}), reclaim_3d={_fmt_bool(inp.gap_reclaim_3d)} ({_fmt_text(inp.gap_reclaim_date)}) |
-| **老王：爆量/凶多吉少/三聲無奈/三陽開泰** | massive_low={fmt(inp.vol_spike_defense)} (Low_broken={_fmt_bool(inp.vol_spike_defense_broken)}), massive_high={fmt(inp.vol_spike_resistance)} (High_broken={_fmt_bool(inp.vol_spike_resistance_broken)}) | 凶多吉少(長黑破三線)={_fmt_bool(inp.bearish_long_black_engulf)}, 三聲無奈={_fmt_bool(inp.san_sheng_wu_nai)}, 三陽開泰={inp.san_yang} |
+| **老王：缺口(收盤)/收復/島狀/防守** | gap={gap_kind}, zone=[{gap_lower},{gap_upper}] | filled_by_close={gap_filled_by_close} ({gap_fill_date}), reclaim_3d={gap_reclaim_3d} ({gap_reclaim_date}) |
+| **老王：爆量/凶多吉少/三聲無奈/三陽開泰** | massive_low={massive_low} (Low_broken={low_broken}), massive_high={massive_high} (High_broken={high_broken}) | 凶多吉少(長黑破三線)={long_black_engulf}, 三聲無奈={san_sheng_wu_nai}, 三陽開泰={inp.san_yang} |
 | **短期均線** | MA5={fmt(inp.ma5)}, MA10={fmt(inp.ma10)} | - |
 | **中期均線** | MA20={ma20}, MA50={fmt(inp.ma50)} | 生命線守護（MA20）：{ma_guard_status} |
 | **長期均線** | MA60={ma60}, MA150={fmt(inp.ma150)}, MA200={fmt(inp.ma200)} | 趨勢位階：{inp.trend_regime} |
 | **波段最高價 (P_high)** | {p_high} | 目前回檔幅度：{fmt_pct(inp.drawdown_pct)} |
-| **成交量能 (V)** | 今日={fmt_int(inp.v_today)} / 均量={fmt_int(inp.v_avg)} | 量能倍數：{fmt(inp.vol_ratio, 2)} 倍（{inp.vol_label}） |
-| **技術指標** | RSI14={fmt(inp.rsi14)}, MACD={fmt(inp.macd)} | 動能：signal={fmt(inp.macd_signal)}, hist={fmt(inp.macd_hist)} |
+| **成交量能 (V)** | 今日={fmt_int(inp.v_today)} / 均量={fmt_int(inp.v_avg)} | 量能倍數：{vol_ratio} 倍（{inp.vol_label}） |
+| **技術指標** | RSI14={fmt(inp.rsi14)}, MACD={fmt(inp.macd)} | 動能：signal={fmt(inp.macd_signal)}, hist={macd_hist} |
 | **大盤濾網** | {inp.benchmark_ticker} P_now={fmt(inp.bench_p_now)} / MA150={fmt(inp.bench_ma150)} | {inp.bench_regime} |
 
-### 2. 🧮 關鍵價位計算明細 (Calculation)
+"""
+    calculation = f"""### 2. 🧮 關鍵價位計算明細 (Calculation)
 
 #### 2.1 哲哲 35 法則運算（逐步代入）
 - 轉弱防線 (0.8)：P_high × 0.8 = {p_high} × 0.8 = {fmt(inp.rule_35_weak)}
@@ -298,21 +336,21 @@ def render_report_md(inp: ReportInputs) -> str:
 - 判斷：Close(P_now) {p_now} {trailing_stop_cmp} Trailing stop {trailing_stop}
 
 #### 2.2 掃地僧風控運算（止損/目標/盈虧比）
-- 止損參數：stop_loss_pct = {fmt_pct(inp.stop_loss_pct * 100.0, 2)}
-- -{fmt_pct(inp.stop_loss_pct * 100.0, 2)} 止損價：entry × (1 - stop_loss_pct) = {p_now} × (1 - {fmt_ratio(inp.stop_loss_pct, 4)}) = {fmt(inp.stop_from_pct)}
+- 止損參數：stop_loss_pct = {stop_loss_pct}
+- -{stop_loss_pct} 止損價：entry × (1 - stop_loss_pct) = {p_now} × (1 - {fmt_ratio(inp.stop_loss_pct, 4)}) = {fmt(inp.stop_from_pct)}
 - MA20 止損價：{ma20}
-- 嚴格止損價（取較緊者 = max(MA20, -pct)）：{fmt(inp.stop)}
-- 預期獲利價：{fmt(inp.target)}
+- 嚴格止損價（取較緊者 = max(MA20, -pct)）：{stop}
+- 預期獲利價：{target}
 - 盈虧比 R：R = (target - entry) / (entry - stop)
-  - 分子：({fmt(inp.target)} - {p_now})
-  - 分母：({p_now} - {fmt(inp.stop)})
-  - R = {fmt(inp.r_ratio, 4)}
+  - 分子：({target} - {p_now})
+  - 分母：({p_now} - {stop})
+  - R = {r_ratio}
 
 #### 2.3 老王（缺口/爆量/三陽開泰）
 **本次偵測結果（含數值/日期）**
-- 最新缺口：{_fmt_text(inp.gap_kind)}（gap_date={_fmt_text(inp.gap_last_date)}；prev_date={_fmt_text(inp.gap_prev_date)}；gap_zone=[{fmt(inp.gap_lower)}, {fmt(inp.gap_upper)}]）
-- 收盤封閉缺口：{_fmt_bool(inp.gap_filled_by_close)}（fill_date={_fmt_text(inp.gap_fill_date_by_close)}；fill_close={fmt(inp.gap_fill_close_by_close)}）
-- 假跌破收復(3日)：{_fmt_bool(inp.gap_reclaim_3d)}（reclaim_date={_fmt_text(inp.gap_reclaim_date)}；reclaim_level={fmt(inp.gap_reclaim_level)}）
+- 最新缺口：{gap_kind}（gap_date={_fmt_text(inp.gap_last_date)}；prev_date={_fmt_text(inp.gap_prev_date)}；gap_zone=[{gap_lower}, {gap_upper}]）
+- 收盤封閉缺口：{gap_filled_by_close}（fill_date={gap_fill_date}；fill_close={fmt(inp.gap_fill_close_by_close)}）
+- 假跌破收復(3日)：{gap_reclaim_3d}（reclaim_date={gap_reclaim_date}；reclaim_level={fmt(inp.gap_reclaim_level)}）
 - 頂部島狀反轉（Bearish）：{_fmt_bool(inp.island_reversal_bearish)}（gap_up_date={_fmt_text(inp.island_bear_gap_up_date)}；gap_down_date={_fmt_text(inp.island_bear_gap_down_date)}）
 - 底部島狀反轉（Bullish）：{_fmt_bool(inp.island_reversal_bullish)}（gap_down_date={_fmt_text(inp.island_bull_gap_down_date)}；gap_up_date={_fmt_text(inp.island_bull_gap_up_date)}）
 
@@ -329,11 +367,11 @@ def render_report_md(inp: ReportInputs) -> str:
 
 - 爆量防守/壓力：
   - massive_date={_fmt_text(inp.vol_spike_date)}
-  - massive_low={fmt(inp.vol_spike_defense)}（Low_broken={_fmt_bool(inp.vol_spike_defense_broken)}）
-  - massive_high={fmt(inp.vol_spike_resistance)}（High_broken={_fmt_bool(inp.vol_spike_resistance_broken)}）
-- 凶多吉少（長黑破三線）：{_fmt_bool(inp.bearish_long_black_engulf)}（長黑K 且 Close 同時跌破 MA5/MA10/MA20）
+  - massive_low={massive_low}（Low_broken={low_broken}）
+  - massive_high={massive_high}（High_broken={high_broken}）
+- 凶多吉少（長黑破三線）：{long_black_engulf}（長黑K 且 Close 同時跌破 MA5/MA10/MA20）
 - 凶多吉少（輔助觀察，不計分）：dist_day={_fmt_bool(inp.bearish_distribution_day)}, up_vol_down={_fmt_bool(inp.bearish_price_up_vol_down)}
-- 三聲無奈：{_fmt_bool(inp.san_sheng_wu_nai)}（MA5/10/20 斜率皆下彎 + MA20>MA10>MA5 + P_now 低於 MA5/10/20）
+- 三聲無奈：{san_sheng_wu_nai}（MA5/10/20 斜率皆下彎 + MA20>MA10>MA5 + P_now 低於 MA5/10/20）
 
 #### 2.4 凱利公式（Kelly Criterion）逐步代入
 - 勝率 W（規則推導）：
@@ -344,29 +382,32 @@ def render_report_md(inp: ReportInputs) -> str:
 {_render_list(inp.kelly_w_components)}
   - 最終（含上下限 0.15~0.85）W = {fmt(inp.kelly_w, 2)}
 - 凱利倉位：f = (W × (R+1) - 1) / R
-  - f = ({fmt(inp.kelly_w, 4)} × ({fmt(inp.r_ratio, 4)} + 1) - 1) / {fmt(inp.r_ratio, 4)}
+  - f = ({fmt(inp.kelly_w, 4)} × ({r_ratio} + 1) - 1) / {r_ratio}
   - f_raw = {fmt(inp.kelly_f_raw, 4)}
   - f_capped（上限 20% 且不小於 0）= {kelly_f_capped_pct}
 
-### 3. 👨‍⚕️ 綜合診斷
-- 量價動能（哲哲）：量能判定 = {inp.vol_label}（倍數 {fmt(inp.vol_ratio, 2)}）;60 日乖離率 = {bias60_pct}%;MACD 動能柱 = {fmt(inp.macd_hist)}
+"""
+    diagnosis = f"""### 3. 👨‍⚕️ 綜合診斷
+- 量價動能（哲哲）：量能判定 = {inp.vol_label}（倍數 {vol_ratio}）;60 日乖離率 = {bias60_pct}%;MACD 動能柱 = {macd_hist}
 - 趨勢紀律（掃地僧）：長線位階 = {inp.trend_regime}；大盤濾網 = {inp.bench_regime}
-- 線型結構（老王）：凶多吉少(長黑破三線) = {_fmt_bool(inp.bearish_long_black_engulf)}；三聲無奈 = {_fmt_bool(inp.san_sheng_wu_nai)}；三陽開泰 = {inp.san_yang}
+- 線型結構（老王）：凶多吉少(長黑破三線) = {long_black_engulf}；三聲無奈 = {san_sheng_wu_nai}；三陽開泰 = {inp.san_yang}
   ；島狀反轉(最近)：{_fmt_text(inp.island_reversal_latest_label)}（date={_fmt_text(inp.island_reversal_latest_date)}）
-  ；缺口：{_fmt_text(inp.gap_kind)}（open={_fmt_bool(inp.gap_open)}, filled={_fmt_bool(inp.gap_filled)}）
-  ；爆量防守/壓力：low={fmt(inp.vol_spike_defense)}（Low_broken={_fmt_bool(inp.vol_spike_defense_broken)}）, high={fmt(inp.vol_spike_resistance)}（High_broken={_fmt_bool(inp.vol_spike_resistance_broken)}）
+  ；缺口：{gap_kind}（open={_fmt_bool(inp.gap_open)}, filled={_fmt_bool(inp.gap_filled)}）
+  ；爆量防守/壓力：low={massive_low}（Low_broken={low_broken}）, high={massive_high}（High_broken={high_broken}）
 
-### 4. 🚀 最終操作指令 (Final Verdict)
+"""
+    verdict = f"""### 4. 🚀 最終操作指令 (Final Verdict)
 **評級：{inp.final_rating}**
 
 - 建議進場價：{p_now}
-- 建議止損價：{fmt(inp.stop)}（觸價強制執行）
+- 建議止損價：{stop}（觸價強制執行）
 - 5% 移動停利價：{trailing_stop}（若 Close 跌破則出清）
 - **勝率 (W)：** {kelly_w_pct}
-- **盈虧比 (R)：** {fmt(inp.r_ratio, 4)}
-- **資金控管 (Kelly)：** 根據勝率 {kelly_w_pct} 與盈虧比 {fmt(inp.r_ratio, 4)}，建議投入資金比例為 **{kelly_f_capped_pct}**（若為負值或為 {MISSING} 則不建議進場；單一標的不超過 20%）
+- **盈虧比 (R)：** {r_ratio}
+- **資金控管 (Kelly)：** 根據勝率 {kelly_w_pct} 與盈虧比 {r_ratio}，建議投入資金比例為 **{kelly_f_capped_pct}**（若為負值或為 {MISSING} 則不建議進場；單一標的不超過 20%）
 
-### 5. 🧾 透明化備註（防幻覺）
+"""
+    transparency = f"""### 5. 🧾 透明化備註（防幻覺）
 {notes_md}
 """
-    return md
+    return "".join((header, sources, evidence, calculation, diagnosis, verdict, transparency))
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from enum import Enum
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VolumeSignal:
     vol_ratio: float | None
     is_attack: bool
@@ -12,9 +12,16 @@ class VolumeSignal:
     label: str
 
 
+# Share volumes average to either 0 or at least 1/window, so anything below this is a zero average.
+_VOL_EPS = 1e-12
+
+# Frozen, so one instance can be returned for every missing-input call.
+_MISSING_VOL_SIGNAL = VolumeSignal(vol_ratio=None, is_attack=False, is_distribution=False, label="MISSING")
+
+
 def volume_signal(vol_today: float | None, vol_avg: float | None, open_: float | None, close: float | None) -> VolumeSignal:
-    if vol_today is None or vol_avg is None or vol_avg == 0:
-        return VolumeSignal(vol_ratio=None, is_attack=False, is_distribution=False, label="MISSING")
+    if vol_today is None or vol_avg is None or abs(vol_avg) < _VOL_EPS:
+        return _MISSING_VOL_SIGNAL
 
     ratio = float(vol_today) / float(vol_avg)
 
@@ -37,7 +44,7 @@ def volume_signal(vol_today: float | None, vol_avg: float | None, open_: float |
 
 
 def san_yang_kai_tai(ma5: float | None, ma10: float | None, ma20: float | None, ma20_slope: float | None) -> bool | None:
-    if None in (ma5, ma10, ma20, ma20_slope):
+    if ma5 is None or ma10 is None or ma20 is None or ma20_slope is None:
         return None
     return (ma5 > ma10 > ma20) and (ma20_slope > 0)
 
@@ -61,7 +68,15 @@ def san_sheng_wu_nai(
     Missing policy: if any required input is None => return None.
     """
 
-    if None in (p_now, ma5, ma10, ma20, ma5_slope, ma10_slope, ma20_slope):
+    if (
+        p_now is None
+        or ma5 is None
+        or ma10 is None
+        or ma20 is None
+        or ma5_slope is None
+        or ma10_slope is None
+        or ma20_slope is None
+    ):
         return None
 
     slopes_down = (ma5_slope < 0) and (ma10_slope < 0) and (ma20_slope < 0)
@@ -89,7 +104,7 @@ class WinRateComponentKind(str, Enum):
     PENALTY = "PENALTY"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WinRateComponent:
     kind: WinRateComponentKind
     name: str
@@ -99,7 +114,7 @@ class WinRateComponent:
     note: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WinRateBreakdown:
     base: float | None
     bonus_total: float
@@ -111,8 +126,12 @@ class WinRateBreakdown:
     components: tuple[WinRateComponent, ...] = ()
 
 
-def _missing(*pairs: tuple[str, object | None]) -> tuple[str, ...]:
-    return tuple(name for name, val in pairs if val is None)
+def _missing(names: tuple[str, ...], *values: object | None) -> tuple[str, ...]:
+    """Names whose matching value is None; `names` is a constant tuple at each call site."""
+    for v in values:
+        if v is None:
+            return tuple(name for name, val in zip(names, values) if val is None)
+    return ()
 
 
 def choose_win_rate_breakdown(
@@ -152,8 +171,8 @@ def choose_win_rate_breakdown(
 
     components: list[WinRateComponent] = []
 
-    base_missing = _missing(("p_now", p_now), ("ma150", ma150), ("ma50", ma50), ("ma200", ma200))
-    if base_missing:
+    if p_now is None or ma150 is None or ma50 is None or ma200 is None:
+        base_missing = _missing(("p_now", "ma150", "ma50", "ma200"), p_now, ma150, ma50, ma200)
         components.append(
             WinRateComponent(
                 kind=WinRateComponentKind.BASE,
@@ -175,8 +194,6 @@ def choose_win_rate_breakdown(
             components=tuple(components),
         )
 
-    assert p_now is not None and ma150 is not None and ma50 is not None and ma200 is not None
-
     bull = (p_now > ma150) and (ma50 > ma200)
     base_w = 0.60 if bull else 0.30
     components.append(
@@ -227,9 +244,9 @@ def choose_win_rate_breakdown(
                     note=note,
                 )
             )
-            if kind == WinRateComponentKind.BONUS:
+            if kind is WinRateComponentKind.BONUS:
                 bonus_total += float(delta_if_true)
-            elif kind == WinRateComponentKind.PENALTY:
+            elif kind is WinRateComponentKind.PENALTY:
                 penalty_total += float(delta_if_true)
             return
 
@@ -249,7 +266,7 @@ def choose_win_rate_breakdown(
         name="三方共振(三陽開泰)",
         delta_if_true=0.10,
         cond=(san_yang is True),
-        missing_fields=_missing(("san_yang", san_yang)),
+        missing_fields=_missing(("san_yang",), san_yang),
     )
 
     # Bonus: 價值回歸 +0.20 (GOLD + RSI<30)
@@ -258,7 +275,7 @@ def choose_win_rate_breakdown(
         name="價值回歸(35法則GOLD + RSI<30)",
         delta_if_true=0.20,
         cond=(rule_35_zone == "GOLD") and (rsi14 is not None) and (rsi14 < 30),
-        missing_fields=_missing(("rule_35_zone", rule_35_zone), ("rsi14", rsi14)),
+        missing_fields=_missing(("rule_35_zone", "rsi14"), rule_35_zone, rsi14),
     )
 
     # Bonus: 多頭動能 +0.10 (bull & vol_ratio>1 & bias60<10)
@@ -268,7 +285,7 @@ def choose_win_rate_breakdown(
         name="多頭動能(bull + 放量 + BIAS60<10)",
         delta_if_true=0.10,
         cond=bull and (vol_ratio is not None) and (vol_ratio > 1.0) and (bias60 is not None) and (bias60 < 10),
-        missing_fields=_missing(("vol_ratio", vol_ratio), ("bias60", bias60)),
+        missing_fields=_missing(("vol_ratio", "bias60"), vol_ratio, bias60),
         note="僅在 Bull base 生效" if bull else "Bear base 不加分",
     )
 
@@ -278,14 +295,14 @@ def choose_win_rate_breakdown(
         name="缺口收盤封閉(向下跳空)",
         delta_if_true=0.10,
         cond=(gap_filled_by_close is True) and (gap_direction_by_close == "DOWN"),
-        missing_fields=_missing(("gap_filled_by_close", gap_filled_by_close), ("gap_direction_by_close", gap_direction_by_close)),
+        missing_fields=_missing(("gap_filled_by_close", "gap_direction_by_close"), gap_filled_by_close, gap_direction_by_close),
     )
     add_rule(
         kind=WinRateComponentKind.PENALTY,
         name="缺口收盤封閉(向上跳空)",
         delta_if_true=-0.10,
         cond=(gap_filled_by_close is True) and (gap_direction_by_close == "UP"),
-        missing_fields=_missing(("gap_filled_by_close", gap_filled_by_close), ("gap_direction_by_close", gap_direction_by_close)),
+        missing_fields=_missing(("gap_filled_by_close", "gap_direction_by_close"), gap_filled_by_close, gap_direction_by_close),
     )
 
     # Penalty: bearish island reversal -0.10 (頂部島狀反轉)
@@ -294,7 +311,7 @@ def choose_win_rate_breakdown(
         name="頂部島狀反轉",
         delta_if_true=-0.10,
         cond=(island_reversal_bearish is True),
-        missing_fields=_missing(("island_reversal_bearish", island_reversal_bearish)),
+        missing_fields=_missing(("island_reversal_bearish",), island_reversal_bearish),
     )
 
     # Bonus: bullish island reversal +0.10 (底部島狀反轉)
@@ -303,7 +320,7 @@ def choose_win_rate_breakdown(
         name="底部島狀反轉",
         delta_if_true=0.10,
         cond=(island_reversal_bullish is True),
-        missing_fields=_missing(("island_reversal_bullish", island_reversal_bullish)),
+        missing_fields=_missing(("island_reversal_bullish",), island_reversal_bullish),
     )
 
     # Penalty: massive volume defense broken -0.10
@@ -312,7 +329,7 @@ def choose_win_rate_breakdown(
         name="爆量防守跌破",
         delta_if_true=-0.10,
         cond=(vol_spike_defense_broken is True),
-        missing_fields=_missing(("vol_spike_defense_broken", vol_spike_defense_broken)),
+        missing_fields=_missing(("vol_spike_defense_broken",), vol_spike_defense_broken),
     )
 
     # Penalty: 凶多吉少 -0.10 (一記重錘破三線)
@@ -322,7 +339,7 @@ def choose_win_rate_breakdown(
         name="凶多吉少(長黑破三線)",
         delta_if_true=-0.10,
         cond=(bearish_long_black_engulf is True),
-        missing_fields=_missing(("bearish_long_black_engulf", bearish_long_black_engulf)),
+        missing_fields=_missing(("bearish_long_black_engulf",), bearish_long_black_engulf),
         note="定義：長黑K且收盤價同時跌破 MA5/MA10/MA20",
     )
 
@@ -332,7 +349,7 @@ def choose_win_rate_breakdown(
         name="三聲無奈",
         delta_if_true=-0.10,
         cond=(san_sheng_wu_nai is True),
-        missing_fields=_missing(("san_sheng_wu_nai", san_sheng_wu_nai)),
+        missing_fields=_missing(("san_sheng_wu_nai",), san_sheng_wu_nai),
     )
 
     # Penalty: open gap not filled -0.10
@@ -341,10 +358,11 @@ def choose_win_rate_breakdown(
         name="開盤缺口未封閉(保守風險)",
         delta_if_true=-0.10,
         cond=(gap_open is True) and (gap_filled is False),
-        missing_fields=_missing(("gap_open", gap_open), ("gap_filled", gap_filled)),
+        missing_fields=_missing(("gap_open", "gap_filled"), gap_open, gap_filled),
     )
 
-    w_raw = float(round(base_w + bonus_total + penalty_total, 4))
+    # round() of a float is already a float; only w_clamped can pick up an int clamp bound.
+    w_raw = round(base_w + bonus_total + penalty_total, 4)
     w_clamped = w_raw
     if w_clamped < clamp_min:
         w_clamped = clamp_min
@@ -353,8 +371,8 @@ def choose_win_rate_breakdown(
 
     return WinRateBreakdown(
         base=base_w,
-        bonus_total=float(round(bonus_total, 4)),
-        penalty_total=float(round(penalty_total, 4)),
+        bonus_total=round(bonus_total, 4),
+        penalty_total=round(penalty_total, 4),
         w_raw=w_raw,
         w_clamped=float(round(w_clamped, 4)),
         clamp_min=clamp_min,
@@ -411,7 +429,7 @@ def choose_win_rate(
     ).w_clamped
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class KellyPlan:
     w: float
     entry: float
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from etf_dashboard.charting import prepare_chart_data
+
+
+def test_chart_averages_of_flat_series_are_exact():
+    idx = pd.date_range("2024-01-01", periods=250, freq="B")
+    hist = pd.DataFrame(
+        {"Open": 100.1, "High": 100.1, "Low": 100.1, "Close": 100.1, "Volume": 1234.7},
+        index=idx,
+    )
+
+    df = prepare_chart_data(hist, ma_windows=(5, 20, 200), volume_avg_window=20).df
+
+    assert (df["MA5"].dropna() == 100.1).all()
+    assert (df["MA200"].dropna() == 100.1).all()
+    assert df["MA200"].notna().sum() == 51
+    assert (df["VAVG20"].dropna() == 1234.7).all()
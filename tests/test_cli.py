@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from etf_dashboard import cli
+from etf_dashboard.cli import _compute_from_history
+
+
+def test_bias60_reads_close_and_ma60_from_the_same_bar():
+    rng = np.random.default_rng(2)
+    close = 100 + np.cumsum(rng.normal(0, 1, 120))
+    close[-10] = np.nan  # MA60 is undefined for the last 10 bars while Close is not
+    idx = pd.date_range("2024-01-01", periods=close.size, freq="B")
+    hist = pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.full(close.size, 1e6)},
+        index=idx,
+    )
+
+    d, _ = _compute_from_history(hist)
+
+    ma60 = hist["Close"].rolling(window=60, min_periods=60).mean()
+    expected = ((hist["Close"] - ma60) / ma60 * 100.0).dropna().iloc[-1]
+    assert d.bias60 == pytest.approx(float(expected), rel=1e-9)
+
+
+def test_main_reports_failed_tickers_and_prints_the_rest(monkeypatch, capsys, tmp_path):
+    def fake_build_report(ticker, **_):
+        if ticker == "BAD":
+            raise RuntimeError(f"No Yahoo history returned for {ticker}")
+        return tmp_path / f"{ticker}.md"
+
+    monkeypatch.setattr(cli, "build_report", fake_build_report)
+
+    assert cli.main(["VOO", "BAD", "QQQ"]) == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines() == [str(tmp_path / "VOO.md"), str(tmp_path / "QQQ.md")]
+    assert err.strip() == "BAD: No Yahoo history returned for BAD"
+
+
+def test_flat_tail_gives_exact_moving_averages_and_zero_slopes():
+    rng = np.random.default_rng(4)
+    close = 100 + np.cumsum(rng.normal(0, 1, 260))
+    close[-30:] = 100.1
+    idx = pd.date_range("2024-01-01", periods=close.size, freq="B")
+    hist = pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.full(close.size, 1e6)},
+        index=idx,
+    )
+
+    d, _ = _compute_from_history(hist)
+
+    assert d.ma5 == d.ma10 == d.ma20 == d.p_now == 100.1
+    assert d.ma5_slope == d.ma10_slope == d.ma20_slope == 0.0
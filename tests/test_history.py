@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from etf_dashboard.history import HistoryArrays
+
+
+def test_history_arrays_keeps_local_dates_for_tz_aware_index():
+    # Taipei midnight is the previous day in UTC; dates must stay on the local calendar.
+    idx = pd.date_range("2024-01-01", periods=3, freq="D", tz="Asia/Taipei")
+    hist = pd.DataFrame(
+        {"Open": [1, 2, 3], "High": [2, 3, 4], "Low": [0, 1, 2], "Close": [1.5, 2.5, 3.5], "Volume": [10, 20, 30]},
+        index=idx,
+    )
+
+    arr = HistoryArrays.from_frame(hist)
+    assert len(arr) == 3
+    assert arr.close.dtype == np.float64
+    assert str(arr.dates[0].astype("datetime64[D]")) == "2024-01-01"
+
+
+def test_history_arrays_tail_is_a_view():
+    idx = pd.date_range("2024-01-01", periods=5, freq="D")
+    hist = pd.DataFrame({c: np.arange(5, dtype=float) for c in ("Open", "High", "Low", "Close", "Volume")}, index=idx)
+
+    arr = HistoryArrays.from_frame(hist)
+    tail = arr.tail(2)
+    assert tail.close.tolist() == [3.0, 4.0]
+    assert np.shares_memory(tail.close, arr.close)
+    assert len(arr.tail(10)) == 5
+    assert len(arr.tail(0)) == 0
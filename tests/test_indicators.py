@@ -1,6 +1,17 @@
+import numpy as np
 import pandas as pd
 
-from etf_dashboard.indicators import sma, rsi
+from etf_dashboard._kernels import (
+    last_valid,
+    macd_arrays,
+    macd_tail,
+    rsi_array,
+    rsi_tail,
+    sma_multi,
+    tail_mean,
+    window_mean,
+)
+from etf_dashboard.indicators import latest_value, macd, sma, rsi
 
 
 def test_sma_basic():
@@ -10,8 +21,100 @@ def test_sma_basic():
     assert float(out.iloc[-1]) == 4.0
 
 
+def test_sma_matches_rolling_with_gaps():
+    s = pd.Series([1.0, 2.0, np.nan, 4.0, 5.0, 6.0], index=pd.date_range("2024-01-01", periods=6), name="Close")
+    out = sma(s, 2)
+    pd.testing.assert_series_equal(out, s.rolling(window=2, min_periods=2).mean(), check_exact=True)
+
+
+def test_sma_of_constant_series_is_exactly_the_constant():
+    s = pd.Series(np.full(300, 100.1))
+    out = sma(s, 200).dropna()
+    assert len(out) == 101
+    assert (out == 100.1).all()
+
+
+def test_sma_multi_matches_rolling():
+    s = pd.Series([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0])
+    out = sma_multi(s.to_numpy(), (2, 3, 20))
+    for k, w in enumerate((2, 3)):
+        expected = s.rolling(window=w, min_periods=w).mean().to_numpy()
+        np.testing.assert_array_equal(out[:, k], expected)
+    assert np.isnan(out[:, 2]).all()
+
+
+def test_trailing_means_follow_sma_multi():
+    a = np.array([3.0, 1.0, 100.1, 100.1, 100.1, np.nan, 7.0])
+    assert window_mean(a[:5], 3) == 100.1
+    assert window_mean(a[:5], 6) is None
+    assert np.isnan(window_mean(a, 3))
+    assert tail_mean(a, 3) == last_valid(sma_multi(a, (3,))[:, 0]) == 100.1
+
+    rng = np.random.default_rng(9)
+    walk = 100 + np.cumsum(rng.normal(0, 1, 250))
+    for w in (5, 20, 200):
+        assert window_mean(walk, w) == sma_multi(walk, (w,))[-1, 0]
+
+
 def test_rsi_range():
     s = pd.Series([1, 2, 3, 2, 2, 4, 5, 6, 5, 7, 8, 7, 9, 10, 9, 11, 12])
     out = rsi(s, 14).dropna()
     assert (out >= 0).all()
     assert (out <= 100).all()
+
+
+def test_rsi_macd_tail_match_series_versions():
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 120))
+    close[[30, 31, 90]] = np.nan
+    s = pd.Series(close)
+
+    assert rsi_tail(close, 14) == last_valid(rsi(s, 14).to_numpy())
+    m = macd(s, 12, 26, 9)
+    assert macd_tail(close, 12, 26, 9) == tuple(last_valid(m[c].to_numpy()) for c in ("macd", "signal", "hist"))
+    assert macd_tail(close[:20], 12, 26, 9) == (None, None, None)
+
+
+def test_rsi_macd_tail_long_history_match_series_versions():
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, 1500))
+    assert rsi_tail(close, 14) == last_valid(rsi(pd.Series(close), 14).to_numpy())
+    m = macd(pd.Series(close), 12, 26, 9)
+    assert macd_tail(close, 12, 26, 9) == tuple(last_valid(m[c].to_numpy()) for c in ("macd", "signal", "hist"))
+
+
+def test_rsi_kernels_match_pandas_ewm_reference():
+    rng = np.random.default_rng(3)
+    s = pd.Series(100 + np.cumsum(rng.normal(0, 1, 80)), name="Close")
+    s.iloc[[10, 40, 41]] = np.nan
+
+    delta = s.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    avg_loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    expected = (100 - (100 / (1 + avg_gain / avg_loss.replace(0, np.nan)))).to_numpy()
+
+    np.testing.assert_array_equal(rsi_array(s.to_numpy(), 14), expected)
+    assert rsi_tail(s.to_numpy(), 14) == last_valid(expected)
+
+
+def test_macd_kernels_match_pandas_ewm_reference():
+    rng = np.random.default_rng(5)
+    s = pd.Series(100 + np.cumsum(rng.normal(0, 1, 90)))
+    s.iloc[[5, 50]] = np.nan
+
+    def ref_ema(x: pd.Series, span: int) -> pd.Series:
+        return x.ewm(span=span, adjust=False, min_periods=span).mean()
+
+    line = ref_ema(s, 12) - ref_ema(s, 26)
+    signal = ref_ema(line, 9)
+    expected = (line.to_numpy(), signal.to_numpy(), (line - signal).to_numpy())
+
+    for got, want in zip(macd_arrays(s.to_numpy(), 12, 26, 9), expected):
+        np.testing.assert_array_equal(got, want)
+    assert macd_tail(s.to_numpy(), 12, 26, 9) == tuple(last_valid(x) for x in expected)
+
+
+def test_latest_value_skips_trailing_nan():
+    assert latest_value(pd.Series([1.0, 2.0, np.nan])) == 2.0
+    assert latest_value(pd.Series([np.nan, np.nan])) is None
+    assert latest_value(pd.Series([], dtype=float)) is None
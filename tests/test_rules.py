@@ -7,6 +7,13 @@ def test_volume_signal_attack():
     assert v.label == "攻擊量"
 
 
+def test_volume_signal_zero_average_is_missing():
+    for vol_avg in (0, 0.0, 1e-300):
+        v = volume_signal(vol_today=200, vol_avg=vol_avg, open_=10, close=11)
+        assert v.vol_ratio is None
+        assert v.label == "MISSING"
+
+
 def test_san_yang_kai_tai_true():
     assert san_yang_kai_tai(11, 10, 9, 0.5) is True
 